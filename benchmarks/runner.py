@@ -0,0 +1,198 @@
+"""Run the benchmark suite and report per-operation latency percentiles and allocations.
+
+Usage (from the repository root):
+
+    python -m benchmarks                          # run everything and print a table
+    python -m benchmarks render/                  # only run benchmarks whose name starts with "render/"
+    python -m benchmarks --json results.json      # also write machine-readable results
+    python -m benchmarks --compare results.json   # compare against results from another commit
+"""
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import sys
+import tracemalloc
+from collections import OrderedDict
+from importlib import import_module
+from time import perf_counter
+
+BENCHMARKS = OrderedDict()
+
+# Results that are slower than the baseline by more than this fraction are reported as regressions
+REGRESSION_THRESHOLD = 0.10
+
+
+# Modules that register benchmarks when they are imported
+SCENARIO_MODULES = ("benchmarks.scenarios", "benchmarks.startup")
+
+
+def benchmark(name, operations=1000, allocations=True):
+    """Register a benchmark.
+
+    The decorated function does any setup and returns a callable that performs one operation. It's called again
+    for every measurement, so that state created by one measurement doesn't leak into the next. Set allocations
+    to False for operations whose memory use tracemalloc can't see, like running a subprocess."""
+
+    def decorator(setup):
+        BENCHMARKS[name] = (setup, operations, allocations)
+        return setup
+
+    return decorator
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure_latency(operation, operations):
+    operation()  # Warm up caches, as a long-running process would have
+    timings = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(operations):
+            start = perf_counter()
+            operation()
+            timings.append(perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    timings.sort()
+    to_us = 1e6
+    return OrderedDict([
+        ("operations", operations),
+        ("mean_us", sum(timings) / len(timings) * to_us),
+        ("p50_us", percentile(timings, 0.50) * to_us),
+        ("p90_us", percentile(timings, 0.90) * to_us),
+        ("p99_us", percentile(timings, 0.99) * to_us),
+        ("max_us", timings[-1] * to_us),
+    ])
+
+
+def measure_allocations(operation, operations):
+    """Return the peak and retained memory per operation, as traced by tracemalloc."""
+
+    operation()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        peaks = []
+        for _ in range(operations):
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            start, _ = tracemalloc.get_traced_memory()
+            operation()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - start)
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return OrderedDict([
+        ("peak_bytes_per_op", sum(peaks) // len(peaks)),
+        ("retained_bytes_per_op", max(0, retained - baseline) // operations),
+    ])
+
+
+def run(names):
+    results = OrderedDict()
+    for name in names:
+        setup, operations, allocations = BENCHMARKS[name]
+        result = measure_latency(setup(), operations)
+        if allocations:
+            result.update(measure_allocations(setup(), max(1, operations // 10)))
+        else:
+            result.update([("peak_bytes_per_op", None), ("retained_bytes_per_op", None)])
+        results[name] = result
+        print_result(name, result)
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    import django
+    return OrderedDict([
+        ("commit", commit),
+        ("python", platform.python_version()),
+        ("django", django.get_version()),
+        ("platform", platform.platform()),
+    ])
+
+
+def print_header():
+    print("{:<40} {:>10} {:>10} {:>10} {:>10} {:>12} {:>12}".format(
+        "benchmark", "mean us", "p50 us", "p90 us", "p99 us", "peak B/op", "kept B/op"))
+
+
+def print_result(name, result):
+    print("{:<40} {:>10.1f} {:>10.1f} {:>10.1f} {:>10.1f} {:>12} {:>12}".format(
+        name, result["mean_us"], result["p50_us"], result["p90_us"], result["p99_us"],
+        format_bytes(result["peak_bytes_per_op"]), format_bytes(result["retained_bytes_per_op"])))
+
+
+def format_bytes(value):
+    return "-" if value is None else value
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    print()
+    print("Compared with {} ({}):".format(baseline_path, (baseline["environment"]["commit"] or "unknown")[:10]))
+    regressions = []
+    for name, result in results.items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            print("{:<40} {:>10}".format(name, "new"))
+            continue
+        change = result["p50_us"] / previous["p50_us"] - 1
+        flag = ""
+        if change > REGRESSION_THRESHOLD:
+            flag = "REGRESSION"
+            regressions.append(name)
+        print("{:<40} {:>+9.1f}% {}".format(name, change * 100, flag))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the django-components benchmark suite.")
+    parser.add_argument("prefixes", nargs="*", help="Only run benchmarks whose name starts with one of these")
+    parser.add_argument("--json", metavar="PATH", help="Write results to PATH as JSON")
+    parser.add_argument("--compare", metavar="PATH", help="Compare p50 latency with results from a previous --json")
+    parser.add_argument("--list", action="store_true", help="List the available benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    # Importing the scenarios configures Django and registers the benchmarks
+    for module in SCENARIO_MODULES:
+        import_module(module)
+
+    names = [name for name in BENCHMARKS if not args.prefixes or name.startswith(tuple(args.prefixes))]
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    print_header()
+    results = run(names)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(OrderedDict([("environment", environment()), ("results", results)]), f, indent=2)
+
+    if args.compare:
+        return 1 if compare(results, args.compare) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+import atexit
+import shutil
+import tempfile
+
+import django
+from django.conf import settings
+
+from benchmarks.runner import benchmark
+
+# Component templates are kept in memory, behind the cached loader, as they would be in production
+TEMPLATES = {
+    "card.html": (
+        '<div class="card">\n'
+        '    <h2>{{ title }}</h2>\n'
+        '    {% slot "body" %}<p>{{ body }}</p>{% endslot %}\n'
+        '</div>\n'
+    ),
+    "wrapper.html": '<section class="wrapper">{% slot "content" %}{% endslot %}</section>\n',
+    "many_slots.html": "".join(
+        '<div>{{% slot "slot{0}" %}}Default {0}{{% endslot %}}</div>\n'.format(i) for i in range(20)
+    ),
+}
+
+if not settings.configured:
+    settings.configure(
+        DEBUG=False,
+        INSTALLED_APPS=("django_components",),
+        TEMPLATES=[{
+            "BACKEND": "django.template.backends.django.DjangoTemplates",
+            "OPTIONS": {
+                "loaders": [
+                    ("django.template.loaders.cached.Loader", [
+                        ("django.template.loaders.locmem.Loader", TEMPLATES),
+                    ]),
+                ],
+                "builtins": ["django_components.templatetags.component_tags"],
+            },
+        }],
+        MIDDLEWARE=["django_components.middleware.ComponentDependencyMiddleware"],
+        DATABASES={},
+    )
+    django.setup()
+
+from unittest.mock import Mock  # NOQA: E402
+
+from django.template import Context, Template, engines  # NOQA: E402
+from django.template.response import TemplateResponse  # NOQA: E402
+
+from django_components import component  # NOQA: E402
+from django_components.middleware import ComponentDependencyMiddleware  # NOQA: E402
+from django_components.template_store import TemplateStore  # NOQA: E402
+
+
+class Card(component.Component):
+    def context(self, title, body="Body"):
+        return {"title": title, "body": body}
+
+    def template(self, context):
+        return "card.html"
+
+    class Media:
+        css = {"all": ["card.css"]}
+        js = ["card.js"]
+
+
+class CachedCard(Card):
+    cache_timeout = 3600
+
+
+class PureCard(Card):
+    pure_context = True
+
+
+class Wrapper(component.Component):
+    def template(self, context):
+        return "wrapper.html"
+
+    class Media:
+        css = {"all": ["wrapper.css"]}
+
+
+class ManySlots(component.Component):
+    def template(self, context):
+        return "many_slots.html"
+
+
+component.registry.clear()
+component.registry.register("card", Card)
+component.registry.register("cached_card", CachedCard)
+component.registry.register("pure_card", PureCard)
+component.registry.register("wrapper", Wrapper)
+component.registry.register("many_slots", ManySlots)
+
+FLAT_SOURCE = "".join('{{% component "card" title="Card {0}" %}}'.format(i) for i in range(50))
+FLAT_PURE_SOURCE = "".join('{{% component "pure_card" title="Card {0}" %}}'.format(i) for i in range(50))
+FLAT_VARIABLES_SOURCE = "".join('{% component "card" title=title body=body %}' for i in range(50))
+
+NESTING_DEPTH = 10
+NESTED_SOURCE = ('{% component_block "wrapper" %}{% slot "content" %}' * NESTING_DEPTH
+                 + '{% component "card" title=title %}'
+                 + "{% endslot %}{% endcomponent_block %}" * NESTING_DEPTH)
+NESTED_ONLY_SOURCE = ('{% component_block "wrapper" only %}{% slot "content" %}' * NESTING_DEPTH
+                      + '{% component "card" title="Card" only %}'
+                      + "{% endslot %}{% endcomponent_block %}" * NESTING_DEPTH)
+DEEP_NESTING_DEPTH = 50
+DEEP_ONLY_SOURCE = ('{% component_block "wrapper" only %}{% slot "content" %}' * DEEP_NESTING_DEPTH
+                    + '{% component "card" title="Card" only %}'
+                    + "{% endslot %}{% endcomponent_block %}" * DEEP_NESTING_DEPTH)
+
+MANY_SLOTS_SOURCE = ('{% component_block "many_slots" %}'
+                     + "".join('{{% slot "slot{0}" %}}Filled {0}{{% endslot %}}'.format(i) for i in range(20))
+                     + "{% endcomponent_block %}")
+
+LOOP_ITEMS = ["Item {}".format(i) for i in range(500)]
+LOOP_SOURCE = '{% for item in items %}{% component "card" title=item %}{% endfor %}'
+LOOP_CACHED_SOURCE = '{% for item in items %}{% component "cached_card" title=item %}{% endfor %}'
+MAP_SOURCE = '{% component_map "card" items as item title=item %}'
+MAP_ONLY_SOURCE = '{% component_map "card" items as item title=item only %}'
+LOOP_ONLY_SOURCE = '{% for item in items %}{% component "card" title=item only %}{% endfor %}'
+
+# A page with 10,000 component tags, a tenth of which fill a slot
+LARGE_PAGE_SOURCE = (
+    "".join('{{% component "card" title="Card {0}" %}}'.format(i) for i in range(9000))
+    + "".join('{{% component_block "card" title="Card {0}" %}}{{% slot "body" %}}Body {0}{{% endslot %}}'
+              "{{% endcomponent_block %}}".format(i) for i in range(1000))
+)
+
+# A large outer context makes the cost of copying it visible
+LARGE_CONTEXT = {"variable_{}".format(i): i for i in range(200)}
+
+
+def render_benchmark(source, context=None):
+    def setup():
+        template = Template(source)
+        context_data = dict(context or {})
+        return lambda: template.render(Context(context_data))
+
+    return setup
+
+
+benchmark("parse/flat", operations=200)(lambda: lambda: Template(FLAT_SOURCE))
+benchmark("parse/many_slots", operations=200)(lambda: lambda: Template(MANY_SLOTS_SOURCE))
+
+
+@benchmark("memory/parse_10k_tags", operations=3)
+def parse_large_page():
+    # Parsed templates are kept, so that retained bytes per operation is the footprint of one parsed template
+    templates = []
+    return lambda: templates.append(Template(LARGE_PAGE_SOURCE))
+
+@benchmark("parse/flat_from_template_store", operations=200)
+def load_from_template_store():
+    engine = engines["django"].engine
+    template = Template(FLAT_SOURCE, engine=engine)
+    store = TemplateStore(tempfile.mkdtemp(prefix="django_components_benchmark_"))
+    atexit.register(shutil.rmtree, store.directory, True)
+    key = store.key(FLAT_SOURCE, engine)
+    store.save(key, template.nodelist)
+    return lambda: store.load(key, engine, template.origin)
+
+
+benchmark("render/flat", operations=500)(render_benchmark(FLAT_SOURCE))
+benchmark("render/flat_pure", operations=500)(render_benchmark(FLAT_PURE_SOURCE))
+benchmark("render/flat_variables", operations=500)(
+    render_benchmark(FLAT_VARIABLES_SOURCE, {"title": "Card", "body": "Body"}))
+benchmark("render/nested", operations=1000)(render_benchmark(NESTED_SOURCE, {"title": "Card"}))
+benchmark("render/many_slots", operations=1000)(render_benchmark(MANY_SLOTS_SOURCE))
+benchmark("render/for_loop", operations=50)(render_benchmark(LOOP_SOURCE, dict(LARGE_CONTEXT, items=LOOP_ITEMS)))
+benchmark("render/for_loop_cached", operations=50)(
+    render_benchmark(LOOP_CACHED_SOURCE, dict(LARGE_CONTEXT, items=LOOP_ITEMS)))
+benchmark("render/for_loop_only", operations=50)(
+    render_benchmark(LOOP_ONLY_SOURCE, dict(LARGE_CONTEXT, items=LOOP_ITEMS)))
+benchmark("render/component_map", operations=50)(render_benchmark(MAP_SOURCE, dict(LARGE_CONTEXT, items=LOOP_ITEMS)))
+benchmark("render/component_map_only", operations=50)(
+    render_benchmark(MAP_ONLY_SOURCE, dict(LARGE_CONTEXT, items=LOOP_ITEMS)))
+benchmark("render/nested_only", operations=1000)(render_benchmark(NESTED_ONLY_SOURCE, LARGE_CONTEXT))
+benchmark("render/deep_only", operations=200)(render_benchmark(DEEP_ONLY_SOURCE, LARGE_CONTEXT))
+
+
+def middleware_benchmark(size):
+    row = '<tr><td class="cell">Lorem ipsum dolor sit amet</td><td>42</td></tr>\n'
+    source = ("<html><head>{% component_css_dependencies %}</head><body><table>"
+              + row * (size // len(row))
+              + '</table>{% component "card" title="Card" %}{% component_js_dependencies %}</body></html>')
+
+    def setup():
+        template = engines["django"].from_string(source)
+        middleware = ComponentDependencyMiddleware(get_response=lambda request: None)
+
+        def operation():
+            request = Mock()
+            response = TemplateResponse(request, template, {})
+            middleware.process_template_response(request, response)
+            return response.render()
+
+        return operation
+
+    return setup
+
+
+benchmark("middleware/response_1MiB", operations=50)(middleware_benchmark(1024 * 1024))
+benchmark("middleware/response_8MiB", operations=10)(middleware_benchmark(8 * 1024 * 1024))
@@ -0,0 +1,87 @@
+"""Benchmarks of worker startup, each measured by starting a fresh interpreter."""
+import atexit
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.runner import benchmark
+
+COMPONENT_COUNT = 300
+COMPONENT_PACKAGE = "startup_components"
+
+COMPONENT_MODULE = '''from django_components import component
+
+
+class Component{index}(component.Component):
+    def context(self, title, items=()):
+        return {{"title": title, "items": items}}
+
+    def template(self, context):
+        return "component_{index}.html"
+
+    class Media:
+        css = {{"all": ["component_{index}.css"]}}
+        js = ["component_{index}.js"]
+
+
+component.registry.register(name="component_{index}", component=Component{index})
+'''
+
+STARTUP_SCRIPT = '''
+import django
+from django.conf import settings
+
+settings.configure(INSTALLED_APPS=["django_components"], COMPONENTS={components!r})
+django.setup()
+
+from django_components.component import registry
+
+registry.get("component_0")
+'''
+
+_component_directory = None
+
+
+def component_directory():
+    """Return a directory with a package of generated component modules, creating it on first use."""
+
+    global _component_directory
+    if _component_directory is None:
+        _component_directory = tempfile.mkdtemp(prefix="django_components_benchmark_")
+        atexit.register(shutil.rmtree, _component_directory, True)
+        package = os.path.join(_component_directory, COMPONENT_PACKAGE)
+        os.mkdir(package)
+        open(os.path.join(package, "__init__.py"), "w").close()
+        for index in range(COMPONENT_COUNT):
+            with open(os.path.join(package, "component_{}.py".format(index)), "w") as f:
+                f.write(COMPONENT_MODULE.format(index=index))
+    return _component_directory
+
+
+def component_paths():
+    return {
+        "component_{}".format(index): "{0}.component_{1}.Component{1}".format(COMPONENT_PACKAGE, index)
+        for index in range(COMPONENT_COUNT)
+    }
+
+
+def startup_benchmark(components):
+    def setup():
+        repository = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([component_directory(), repository]))
+        command = [sys.executable, "-c", STARTUP_SCRIPT.format(components=components)]
+        return lambda: subprocess.check_call(command, env=env)
+
+    return setup
+
+
+benchmark("startup/eager_libraries", operations=10, allocations=False)(startup_benchmark({
+    "autodiscover": False,
+    "libraries": sorted({path.rsplit(".", 1)[0] for path in component_paths().values()}),
+}))
+benchmark("startup/lazy_manifest", operations=10, allocations=False)(startup_benchmark({
+    "autodiscover": False,
+    "manifest": component_paths(),
+}))
@@ -1,3 +1,4 @@
+import json
 from importlib import import_module
 
 from django.utils.module_loading import autodiscover_modules
@@ -6,10 +7,25 @@ default_app_config = "django_components.apps.ComponentsConfig"
 
 
 def autodiscover():
-    # look for "components" module/pkg in each app
     from . import app_settings
+    from .component import registry
+
+    # Components in the manifest are only imported when they are first used
+    for name, path in load_manifest(app_settings.MANIFEST).items():
+        registry.register(name=name, component=path)
 
+    # look for "components" module/pkg in each app
     if app_settings.AUTODISCOVER:
         autodiscover_modules("components")
     for path in app_settings.LIBRARIES:
         import_module(path)
+
+
+def load_manifest(manifest):
+    """Return the mapping of component names to dotted paths in manifest, which is either such a mapping or the path
+    to a JSON file that contains one."""
+
+    if isinstance(manifest, str):
+        with open(manifest) as f:
+            return json.load(f)
+    return manifest
@@ -4,8 +4,9 @@ from django.conf import settings
 
 
 class AppSettings:
-    def __init__(self):
-        self.settings = getattr(settings, "COMPONENTS", {})
+    @property
+    def settings(self):
+        return getattr(settings, "COMPONENTS", {})
 
     @property
     def AUTODISCOVER(self):
@@ -15,10 +16,54 @@ class AppSettings:
     def LIBRARIES(self):
         return self.settings.setdefault("libraries", [])
 
+    @property
+    def WARM_UP(self):
+        return self.settings.setdefault("warm_up", False)
+
+    @property
+    def MANIFEST(self):
+        return self.settings.setdefault("manifest", {})
+
+    @property
+    def STREAM_DEPENDENCIES(self):
+        return self.settings.setdefault("stream_dependencies", True)
+
+    @property
+    def BUNDLE_DEPENDENCIES(self):
+        return self.settings.setdefault("bundle_dependencies", False)
+
+    @property
+    def BUNDLE_DIRECTORY(self):
+        return self.settings.setdefault("bundle_directory", "django_components/bundles")
+
+    @property
+    def INLINE_DEPENDENCIES_MAX_SIZE(self):
+        return self.settings.setdefault("inline_dependencies_max_size", None)
+
     @property
     def TEMPLATE_CACHE_SIZE(self):
         return self.settings.setdefault("template_cache_size", 128)
 
+    @property
+    def TEMPLATE_STORE(self):
+        return self.settings.setdefault("template_store", None)
+
+    @property
+    def TEMPLATE_STORE_VERSION(self):
+        return self.settings.setdefault("template_store_version", "")
+
+    @property
+    def MINIFY_TEMPLATES(self):
+        return self.settings.setdefault("minify_templates", False)
+
+    @property
+    def FRAGMENT_CACHE(self):
+        return self.settings.setdefault("fragment_cache", None)
+
+    @property
+    def FRAGMENT_CACHE_SIZE(self):
+        return self.settings.setdefault("fragment_cache_size", 1024)
+
 
 app_settings = AppSettings()
 app_settings.__name__ = __name__
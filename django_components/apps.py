@@ -1,8 +1,21 @@
+import logging
+
 from django.apps import AppConfig
 
+logger = logging.getLogger(__name__)
+
 
 class ComponentsConfig(AppConfig):
     name = "django_components"
 
     def ready(self):
         self.module.autodiscover()
+
+        from django_components import app_settings
+        if app_settings.WARM_UP:
+            from django_components.warmup import warm_up
+            result = warm_up()
+            for name, error in result.errors:
+                logger.warning("Could not warm up component '%s': %r", name, error)
+            logger.info("Warmed up %d templates for %d components in %.3f s.",
+                        result.templates, result.components, result.duration)
@@ -0,0 +1,158 @@
+import asyncio
+from contextlib import contextmanager
+from time import perf_counter
+
+from django.template.loader import get_template, select_template
+from django.template.response import TemplateResponse
+
+from django_components import signals
+
+ASYNC_RENDER_CONTEXT_KEY = "_COMPONENT_ASYNC_RENDER"
+
+# Returned instead of a component's context while its context() coroutine hasn't been awaited
+PENDING = object()
+
+
+class AsyncRender:
+    """The component contexts of an async render, keyed by where each component was rendered.
+
+    The template is rendered in passes. Components with an async context() method start their coroutine the first
+    time they are rendered, and render nothing. Between passes all started coroutines are awaited concurrently, and
+    the next pass renders those components with their results, which may start coroutines of components nested
+    inside them. Contexts of synchronous components are remembered too, so context() is only called once for each
+    component that is rendered.
+
+    A component is identified by its node and how many times that node has been rendered inside the component that
+    contains it, which is the same in every pass.
+
+    While the render signals have listeners, the time spent in each context() method is kept in context_times."""
+
+    def __init__(self):
+        self.contexts = {}
+        self.pending = {}
+        self.fetch_count = 0
+        self.context_times = {}
+        self.timed = signals.is_enabled()
+        self._scopes = [()]
+        self._counts = {}
+
+    def start_pass(self):
+        self._scopes = [()]
+        self._counts = {}
+
+    def key(self, node):
+        scope = self._scopes[-1]
+        count = self._counts.get((scope, node), 0)
+        self._counts[(scope, node)] = count + 1
+        return scope + ((node, count),)
+
+    @contextmanager
+    def scope(self, key):
+        """Identify components rendered inside the block as children of the component with key."""
+
+        self._scopes.append(key)
+        try:
+            yield
+        finally:
+            self._scopes.pop()
+
+    def get_context(self, key, component, args, kwargs, is_async):
+        """Return the context of the component with key, or PENDING if it will be available in the next pass."""
+
+        try:
+            return self.contexts[key]
+        except KeyError:
+            pass
+        if is_async:
+            if key not in self.pending:
+                self.pending[key] = component.context(*args, **kwargs)
+                self.fetch_count += 1
+            return PENDING
+        if not self.timed:
+            component_context = self.contexts[key] = component.context(*args, **kwargs)
+            return component_context
+        start = perf_counter()
+        component_context = self.contexts[key] = component.context(*args, **kwargs)
+        self.context_times[key] = perf_counter() - start
+        return component_context
+
+    async def gather(self):
+        """Await all pending context() coroutines concurrently."""
+
+        keys = list(self.pending)
+        if self.timed:
+            coroutines = [self.time_context(key, self.pending[key]) for key in keys]
+        else:
+            coroutines = [self.pending[key] for key in keys]
+        results = await asyncio.gather(*coroutines)
+        self.pending = {}
+        self.contexts.update(zip(keys, results))
+
+    async def time_context(self, key, coroutine):
+        start = perf_counter()
+        try:
+            return await coroutine
+        finally:
+            self.context_times[key] = perf_counter() - start
+
+    def close(self):
+        """Close coroutines that were started but won't be awaited."""
+
+        for coroutine in self.pending.values():
+            coroutine.close()
+        self.pending = {}
+
+
+async def render_async(template, context=None, request=None):
+    """Render a backend template, such as one returned by get_template(), fetching the contexts of components that
+    have an async context() method concurrently.
+
+    Template rendering, and context() methods that aren't async, run in a thread, so they can use the database."""
+
+    from asgiref.sync import sync_to_async
+
+    async_render = AsyncRender()
+    context = dict(context or {})
+    context[ASYNC_RENDER_CONTEXT_KEY] = async_render
+    render = sync_to_async(template.render, thread_sensitive=True)
+
+    try:
+        while True:
+            async_render.start_pass()
+            rendered = await render(context, request)
+            if not async_render.pending:
+                return rendered
+            await async_render.gather()
+    finally:
+        async_render.close()
+
+
+async def render_to_string_async(template_name, context=None, request=None, using=None):
+    """Async version of django.template.loader.render_to_string() that fetches component contexts concurrently."""
+
+    from asgiref.sync import sync_to_async
+
+    if isinstance(template_name, (list, tuple)):
+        template = await sync_to_async(select_template, thread_sensitive=True)(template_name, using=using)
+    else:
+        template = await sync_to_async(get_template, thread_sensitive=True)(template_name, using=using)
+    return await render_async(template, context, request)
+
+
+class AsyncTemplateResponse(TemplateResponse):
+    """TemplateResponse for async views, that fetches component contexts concurrently when Django's async request
+    handler renders it."""
+
+    async def render(self):
+        from asgiref.sync import sync_to_async
+
+        retval = self
+        if not self._is_rendered:
+            template = await sync_to_async(self.resolve_template, thread_sensitive=True)(self.template_name)
+            context = self.resolve_context(self.context_data)
+            self.content = await render_async(template, context, self._request)
+            for post_callback in self._post_render_callbacks:
+                newretval = post_callback(retval)
+                if newretval is not None:
+                    retval = newretval
+        return retval
@@ -0,0 +1,129 @@
+import hashlib
+import os
+import posixpath
+import re
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import SuspiciousOperation
+from django.core.files.base import ContentFile
+from django.forms import Media
+from django.templatetags.static import static
+
+from django_components import app_settings
+
+# Relative URLs in a stylesheet, which have to be made absolute when the stylesheet is moved into a bundle
+CSS_URL_REGEX = re.compile(r"""url\(\s*(['"]?)(?![a-zA-Z][a-zA-Z0-9+.-]*:|/|#)([^'")]+?)\1\s*\)""")
+
+
+def bundle_media(media, files=None):
+    """Return a Media that refers to bundles of the static files of media instead of to the files themselves.
+
+    The static files of each CSS medium, and the JS files, are concatenated into a bundle named after a hash of its
+    content, which is saved to the staticfiles storage unless it is there already. Files referred to by absolute URL,
+    and files that can't be found, are kept as they are, and split the files around them into separate bundles so
+    that the order of the files is kept. Scripts are only bundled when they aren't imported as modules, since modules
+    have a scope of their own.
+
+    If files is a list, the (absolute path, modification time) of each bundled file that the staticfiles finders
+    found is appended to it, so that the bundles can be built again when one of them changes."""
+
+    css = {medium: bundle_files(paths, "css", b"\n", rewrite_css_urls, files) for medium, paths in media._css.items()}
+    js = media._js
+    if not getattr(settings, "IMPORT_SCRIPTS_AS_MODULES", False):
+        # Keep a script that doesn't end with a semicolon from running into the next one
+        js = bundle_files(js, "js", b"\n;\n", files=files)
+    return Media(css=css, js=js)
+
+
+def bundle_files(paths, extension, separator, transform=None, files=None):
+    """Return paths with each run of consecutive static files among them replaced by the URL of a bundle."""
+
+    result, bundled, contents, bundled_files = [], [], [], []
+
+    def end_run():
+        if len(bundled) == 1:
+            result.extend(bundled)
+        elif bundled:
+            result.append(save_bundle(separator.join(contents), extension))
+            if files is not None:
+                files.extend(bundled_files)
+        del bundled[:], contents[:], bundled_files[:]
+
+    for path in paths:
+        absolute_path, mtime, content = read_static_file(path) if is_static_path(path) else (None, None, None)
+        if content is not None and transform is not None:
+            content = transform(path, content)
+        if content is None:
+            end_run()
+            result.append(path)
+        else:
+            bundled.append(path)
+            contents.append(content)
+            if absolute_path is not None:
+                bundled_files.append((absolute_path, mtime))
+    end_run()
+    return result
+
+
+def is_static_path(path):
+    # Media renders these paths as they are, and other paths through the staticfiles storage
+    return not path.startswith(("http://", "https://", "/"))
+
+
+def modification_time(absolute_path):
+    try:
+        return os.stat(absolute_path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def read_static_file(path):
+    """Return the absolute path, modification time and content of a static file, from the directories it is
+    collected from or the storage it was collected to.
+
+    The path and modification time are None for files read from the storage, and all three are None if the file
+    can't be found."""
+
+    try:
+        absolute_path = finders.find(path)
+        if absolute_path:
+            mtime = modification_time(absolute_path)
+            with open(absolute_path, "rb") as f:
+                return absolute_path, mtime, f.read()
+        with staticfiles_storage.open(path) as f:
+            return None, None, f.read()
+    except (OSError, SuspiciousOperation):
+        return None, None, None
+
+
+def rewrite_css_urls(path, content):
+    """Make the relative URLs in a stylesheet at path absolute, or return None if it isn't UTF-8."""
+
+    try:
+        text = content.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+    directory = posixpath.dirname(path)
+
+    def absolute_url(match):
+        url, suffix = re.match(r"([^?#]*)(.*)", match.group(2)).groups()
+        return 'url("%s%s")' % (static(posixpath.normpath(posixpath.join(directory, url))), suffix)
+
+    return CSS_URL_REGEX.sub(absolute_url, text).encode("utf-8")
+
+
+def save_bundle(content, extension):
+    """Save a bundle to the staticfiles storage, unless it is there already, and return its URL."""
+
+    name = posixpath.join(app_settings.BUNDLE_DIRECTORY,
+                          "%s.%s" % (hashlib.sha256(content).hexdigest()[:16], extension))
+    if not staticfiles_storage.exists(name):
+        name = staticfiles_storage.save(name, ContentFile(content))
+    try:
+        return staticfiles_storage.url(name)
+    except ValueError:
+        # Storages with a manifest only know the files that were collected, and bundle names contain a hash already
+        return urljoin(staticfiles_storage.base_url, name)
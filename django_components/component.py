@@ -1,26 +1,56 @@
 import warnings
+from collections.abc import Mapping
 from copy import copy
-from functools import lru_cache
-from itertools import chain
+from time import perf_counter
+from types import MappingProxyType
 
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.forms.widgets import MediaDefiningClass
-from django.template.base import NodeList, TokenType
+from django.template import Context
+from django.template.defaulttags import IfNode
 from django.template.loader import get_template
 from django.utils.safestring import mark_safe
 
 # Allow "component.AlreadyRegistered" instead of having to import these everywhere
+from django_components import app_settings, signals
 from django_components.component_registry import AlreadyRegistered, ComponentRegistry, NotRegistered  # noqa
+from django_components.minify import minify_template
+from django_components.template_cache import template_cache
 
-TEMPLATE_CACHE_SIZE = getattr(settings, "COMPONENTS", {}).get('TEMPLATE_CACHE_SIZE', 128)
+# Shared by the many component usages that don't fill slots or take keyword arguments
+EMPTY_MAPPING = MappingProxyType({})
+
+# Context key of the slot table of the component being rendered: a pair of the slots it was given, and the slot table
+# of the template it was used in
+SLOT_TABLE_CONTEXT_KEY = "_COMPONENT_SLOTS"
 
 
 class Component(metaclass=MediaDefiningClass):
+    # Set to False on components that never read outer_context, so that rendering them doesn't need to capture it
+    uses_outer_context = True
+    outer_context = None
+    # Set to a number of seconds to cache the rendered output of the component. Renders share a cached fragment when
+    # get_cache_key() returns the same values, the context variables named in cache_vary_on have the same values and
+    # the same slots are filled.
+    cache_timeout = None
+    cache_vary_on = ()
+    # Set to True on components whose context() only depends on its arguments. A component tag whose arguments are
+    # all literals then calls context() once, the first time it is rendered, and reuses the result.
+    pure_context = False
+    # Names of the templates that template() can return, for components that choose their template from the context.
+    # Used to load and compile the templates ahead of the first request.
+    template_variants = ()
+    instance_template = None
 
     def __init__(self, component_name):
         self.__component_name = component_name
-        self.instance_template = None
-        self.slots = {}
+        self.slots = EMPTY_MAPPING
+
+    @property
+    def component_name(self):
+        return self.__component_name
 
     def context(self):
         return {}
@@ -28,71 +58,337 @@ class Component(metaclass=MediaDefiningClass):
     def template(self, context):
         raise NotImplementedError("Missing template() method on component")
 
+    def get_cache_key(self, *args, **kwargs):
+        """Return the values that identify the rendered output of the component, given the arguments it was called
+        with. Only used when cache_timeout is set."""
+
+        return args, kwargs
+
     def render_dependencies(self):
         """Helper function to access media.render()"""
 
-        return self.media.render()
+        return get_rendered_media(type(self)).rendered
 
     def render_css_dependencies(self):
         """Render only CSS dependencies available in the media class."""
 
-        return mark_safe("\n".join(self.media.render_css()))
+        return get_rendered_media(type(self)).css
 
     def render_js_dependencies(self):
         """Render only JS dependencies available in the media class."""
 
-        return mark_safe("\n".join(self.media.render_js()))
+        return get_rendered_media(type(self)).js
 
     @staticmethod
     def slots_in_template(template):
-        return {node.name: node.nodelist for node in template.template.nodelist if is_slot_node(node)}
+        """Return the default nodelist of each slot in a backend template, including slots nested in other tags."""
+
+        component_template = template.template
+        return {name: node_at(component_template.nodelist, paths[0]).nodelist
+                for name, paths in get_slot_index(component_template).items()}
 
-    @lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
     def compile_instance_template(self, template_name):
-        """Use component's base template and the slots used for this instance to compile
-        a unified template for this instance."""
-
-        component_template = get_template(template_name)
-        slots_in_template = self.slots_in_template(component_template)
-
-        defined_slot_names = set(slots_in_template.keys())
-        filled_slot_names = set(self.slots.keys())
-        unexpected_slots = filled_slot_names - defined_slot_names
-        if unexpected_slots:
-            if settings.DEBUG:
-                warnings.warn(
-                    "Component {} was provided with unexpected slots: {}".format(
-                        self.__component_name, unexpected_slots
-                    )
+        """Return the render plan of one of the component's templates.
+
+        Render plans are shared between all instances of the component class, whichever slots they fill."""
+
+        key = (type(self), template_name)
+        return template_cache.get_or_set(key, lambda: RenderPlan(load_component_template(template_name)))
+
+    def check_slots(self, plan):
+        """Warn about filled slots that the template of plan doesn't define, if DEBUG is on."""
+
+        unexpected_slots = set(self.slots) - set(get_slot_index(plan.template))
+        if unexpected_slots and settings.DEBUG:
+            warnings.warn(
+                "Component {} was provided with unexpected slots: {}".format(
+                    self.__component_name, unexpected_slots
                 )
-            for unexpected_slot in unexpected_slots:
-                del self.slots[unexpected_slot]
+            )
+
+    def slot_table(self, context):
+        """Return the slot table that the slot nodes of the component's template look up their content in."""
 
-        combined_slots = dict(slots_in_template, **self.slots)
-        if combined_slots:
-            # Replace slot nodes with their nodelists, then combine into a single, flat nodelist
-            node_iterator = ([node] if not is_slot_node(node) else combined_slots[node.name]
-                             for node in component_template.template.nodelist)
+        return self.slots, context.get(SLOT_TABLE_CONTEXT_KEY)
 
-            instance_template = copy(component_template.template)
-            instance_template.nodelist = NodeList(chain.from_iterable(node_iterator))
+    def render(self, context):
+        if signals.is_enabled():
+            return self.render_instrumented(context)
+        return self.render_plan(self.compile_instance_template(self.template(context)), context)
+
+    def render_plan(self, plan, context):
+        if plan.has_slots:
+            slot_table = self.slot_table(context)
+        elif context.get(SLOT_TABLE_CONTEXT_KEY) is None:
+            return plan.render(context)
         else:
-            instance_template = component_template.template
+            # Slots in templates that this one includes or extends mustn't see the fills of an enclosing component
+            slot_table = None
+        with context.push({SLOT_TABLE_CONTEXT_KEY: slot_table}):
+            return plan.render(context)
 
-        return instance_template
+    def render_instrumented(self, context):
+        """Render the component like render(), sending the render signals around it."""
 
-    def render(self, context):
-        template_name = self.template(context)
-        instance_template = self.compile_instance_template(template_name)
-        return instance_template.render(context)
+        component_class = type(self)
+        signals.component_pre_render.send(sender=component_class, name=self.__component_name, component=self)
+        rendered = None
+        start = perf_counter()
+        try:
+            rendered = self.render_plan(self.compile_instance_template(self.template(context)), context)
+            return rendered
+        finally:
+            signals.component_post_render.send(
+                sender=component_class, name=self.__component_name, component=self, context_time=0.0,
+                render_time=perf_counter() - start, size=None if rendered is None else len(rendered), cache_hit=None,
+                pending=False,
+            )
+
+    def render_many(self, contexts):
+        """Render the component once for each dict of context values in contexts, and return a list of the results.
+
+        All rows are rendered with a single Context, whose values are replaced between rows, and the compiled
+        template is only looked up again when template() returns a different name."""
+
+        context = Context()
+        row_context = context.push()
+        slot_table = self.slot_table(context)
+        template_name = plan = None
+        rendered = []
+        for values in contexts:
+            row_context.clear()
+            row_context.update(values)
+            row_template_name = self.template(context)
+            if row_template_name != template_name:
+                template_name = row_template_name
+                plan = self.compile_instance_template(template_name)
+            if plan.has_slots:
+                row_context[SLOT_TABLE_CONTEXT_KEY] = slot_table
+            rendered.append(plan.render(context))
+        return rendered
 
     class Media:
         css = {}
         js = []
 
 
+class ComponentBinding:
+    """The component that a component tag renders: its class, the name it was registered under, and the slots the
+    tag fills.
+
+    Templates hold one of these for each component tag, rather than a Component, and the Component is created
+    when the tag is rendered."""
+
+    __slots__ = ("component_class", "component_name", "slots")
+
+    def __init__(self, component_class, component_name, slots=EMPTY_MAPPING):
+        self.component_class, self.component_name, self.slots = component_class, component_name, slots
+
+    def __repr__(self):
+        return "<Component Binding: %s as %r>" % (self.component_class.__name__, self.component_name)
+
+    def create(self):
+        """Return a new instance of the component, with the slots filled by the tag."""
+
+        component = self.component_class(self.component_name)
+        component.slots = self.slots
+        return component
+
+
+class RenderedMedia:
+    """The media of a component class, rendered once and shared by every render of the component."""
+
+    __slots__ = ("media", "css", "js", "rendered", "has_media")
+
+    def __init__(self, media):
+        self.media = media
+        self.css = mark_safe("\n".join(media.render_css()))
+        self.js = mark_safe("\n".join(media.render_js()))
+        self.rendered = mark_safe("\n".join(part for part in (self.css, self.js) if part))
+        self.has_media = bool(self.rendered)
+
+
+# Rendered media by component class. Rendering resolves static URLs, so this is cleared when static files settings
+# change.
+rendered_media_by_class = {}
+
+
+def get_rendered_media(component_class):
+    rendered_media = rendered_media_by_class.get(component_class)
+    if rendered_media is None:
+        # MediaDefiningClass only makes media available on instances
+        media = component_class(component_class.__name__).media
+        rendered_media = rendered_media_by_class[component_class] = RenderedMedia(media)
+    return rendered_media
+
+
+def get_media(component_class):
+    """Return the Media of a component class."""
+
+    return get_rendered_media(component_class).media
+
+
+@receiver(setting_changed, dispatch_uid="django_components_rendered_media_by_class_setting_changed")
+def clear_rendered_media_on_setting_changed(sender, setting, **kwargs):
+    if setting in ("STATIC_URL", "STATICFILES_STORAGE"):
+        rendered_media_by_class.clear()
+
+
+class OuterContext(Mapping):
+    """Read-only view of the template context that a component was rendered in.
+
+    Creating the view only copies the context's stack of dicts. Values are looked up, and remembered, when they are
+    first accessed, so rendering a component doesn't cost time proportional to the size of the outer context."""
+
+    __slots__ = ("_dicts", "_resolved")
+
+    def __init__(self, context):
+        self._dicts = context.dicts[::-1]
+        self._resolved = {}
+
+    def __getitem__(self, key):
+        try:
+            return self._resolved[key]
+        except KeyError:
+            pass
+        for d in self._dicts:
+            if key in d:
+                value = self._resolved[key] = d[key]
+                return value
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self.flatten())
+
+    def __len__(self):
+        return len(self.flatten())
+
+    def __repr__(self):
+        return "<OuterContext: %r>" % self.flatten()
+
+    def new(self):
+        """Return a view of the same dicts that doesn't remember values looked up through this one."""
+
+        outer_context = object.__new__(type(self))
+        outer_context._dicts = self._dicts
+        outer_context._resolved = {}
+        return outer_context
+
+    def flatten(self):
+        """Return the whole outer context as a single dictionary."""
+
+        flat = {}
+        for d in reversed(self._dicts):
+            flat.update(d)
+        flat.update(self._resolved)
+        return flat
+
+
+def load_component_template(template_name):
+    """Return the compiled template that a component renders, minified if the minify_templates setting is on."""
+
+    template = get_template(template_name).template
+    if app_settings.MINIFY_TEMPLATES:
+        template = minify_template(template)
+    return template
+
+
+class RenderPlan:
+    """A compiled component template, shared by every usage of the component whichever slots it fills.
+
+    The slot nodes in the template look up what to render in the slot table of the component that is rendered, so
+    filling slots doesn't need a template of its own."""
+
+    __slots__ = ("template", "has_slots")
+
+    def __init__(self, template):
+        self.has_slots = bool(get_slot_index(template))
+        if any(is_slot_node(node) for node in template.nodelist):
+            # Imported here because the template tag library imports this module
+            from django_components.templatetags.component_tags import SlottedNodeList
+
+            # Render through a copy of the template so that debug information and test instrumentation still
+            # refer to the component's template
+            self.template = copy(template)
+            self.template.nodelist = SlottedNodeList(template.nodelist)
+        else:
+            self.template = template
+
+    def render(self, context):
+        return self.template.render(context)
+
+
 def is_slot_node(node):
-    return node.token.token_type == TokenType.BLOCK and node.token.split_contents()[0] == "slot"
+    # Imported here because the template tag library imports this module
+    from django_components.templatetags.component_tags import SlotNode
+
+    return isinstance(node, SlotNode)
+
+
+def get_slot_index(template):
+    """Return the paths of the slot nodes in a compiled template, by slot name.
+
+    A path is a tuple that starts with the index of a node in the template's nodelist, and continues with the key of
+    a nodelist inside that node and the index of a node in it, for as many levels as the slot is nested. The keys are
+    attribute names, the positions of the branches of an {% if %}, or the names of the slots filled by a
+    component_block. The index is built once per template and stored on it."""
+
+    try:
+        return template._component_slot_index
+    except AttributeError:
+        pass
+    slot_index = {}
+    for path, node in find_slot_nodes(template.nodelist, ()):
+        slot_index.setdefault(node.name, []).append(path)
+    slot_index = template._component_slot_index = {name: tuple(paths) for name, paths in slot_index.items()}
+    return slot_index
+
+
+def find_slot_nodes(nodelist, prefix):
+    """Yield the path and node of every slot node in nodelist, at any depth."""
+
+    for index, node in enumerate(nodelist):
+        path = prefix + (index,)
+        if is_slot_node(node):
+            yield path, node
+        for key, child_nodelist in child_nodelists(node):
+            yield from find_slot_nodes(child_nodelist, path + (key,))
+
+
+def child_nodelists(node):
+    """Yield the key and value of each nodelist directly inside node."""
+
+    from django_components.templatetags.component_tags import ComponentNode
+
+    if isinstance(node, IfNode):
+        # Each branch of an {% if %} has its own nodelist, which isn't listed in child_nodelists
+        for key, (_, nodelist) in enumerate(node.conditions_nodelists):
+            yield key, nodelist
+    elif isinstance(node, ComponentNode):
+        # Slots inside the slots that a component_block fills belong to the template that contains the tag
+        yield from node.binding.slots.items()
+    else:
+        for key in node.child_nodelists:
+            nodelist = getattr(node, key, None)
+            if nodelist:
+                yield key, nodelist
+
+
+def get_child_nodelist(node, key):
+    from django_components.templatetags.component_tags import ComponentNode
+
+    if isinstance(node, IfNode):
+        return node.conditions_nodelists[key][1]
+    if isinstance(node, ComponentNode):
+        return node.binding.slots[key]
+    return getattr(node, key)
+
+
+def node_at(nodelist, path):
+    node = nodelist[path[0]]
+    for i in range(1, len(path), 2):
+        node = get_child_nodelist(node, path[i])[path[i + 1]]
+    return node
 
 
 # This variable represents the global component registry
@@ -1,3 +1,6 @@
+from django.utils.module_loading import import_string
+
+
 class AlreadyRegistered(Exception):
     pass
 
@@ -8,27 +11,63 @@ class NotRegistered(Exception):
 
 class ComponentRegistry(object):
     def __init__(self):
-        self._registry = {}  # component name -> component_class mapping
+        self._registry = {}  # component name -> component_class, or dotted path to it for lazy registrations
 
     def register(self, name=None, component=None):
-        if name in self._registry:
+        """Register a component class under name.
+
+        component can also be the dotted path to a component class, which is only imported the first time the
+        component is looked up. The module that defines it may register the class itself when it is imported."""
+
+        registered = self._registry.get(name)
+        if registered is not None and not (isinstance(registered, str) and not isinstance(component, str)):
             raise AlreadyRegistered('The component "%s" is already registered' % name)
 
         self._registry[name] = component
 
     def unregister(self, name):
-        self.get(name)
+        if name not in self._registry:
+            raise NotRegistered('The component "%s" is not registered' % name)
 
         del self._registry[name]
 
     def get(self, name):
-        if name not in self._registry:
+        try:
+            component = self._registry[name]
+        except KeyError:
             raise NotRegistered('The component "%s" is not registered' % name)
 
-        return self._registry[name]
+        if isinstance(component, str):
+            component = self._import(name, component)
+        return component
+
+    def _import(self, name, path):
+        component = import_string(path)
+        # Importing the module may have registered the class already
+        if isinstance(self._registry.get(name), str):
+            self._registry[name] = component
+        return component
+
+    def is_loaded(self, name):
+        """Return whether the class of a registered component has been imported."""
+
+        return not isinstance(self._registry.get(name), str)
 
     def all(self):
+        """Return all registered components by name, importing those that were registered lazily."""
+
+        for name, component in list(self._registry.items()):
+            if isinstance(component, str):
+                self._import(name, component)
         return self._registry
 
+    def manifest(self):
+        """Return the dotted path of every registered component class by name, for use as the manifest setting."""
+
+        return {
+            name: component if isinstance(component, str) else "%s.%s" % (component.__module__, component.__qualname__)
+            for name, component in self._registry.items()
+        }
+
     def clear(self):
         self._registry = {}
@@ -0,0 +1,11 @@
+from django_components.middleware import RENDERED_COMPONENTS_CONTEXT_KEY, RENDERED_COMPONENTS_REQUEST_ATTRIBUTE
+
+
+def component_dependencies(request):
+    """Expose the set of components rendered during this request to templates that aren't rendered through a
+    TemplateResponse, such as those generating a StreamingHttpResponse."""
+
+    rendered_components = getattr(request, RENDERED_COMPONENTS_REQUEST_ATTRIBUTE, None)
+    if rendered_components is None:
+        return {}
+    return {RENDERED_COMPONENTS_CONTEXT_KEY: rendered_components}
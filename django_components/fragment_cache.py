@@ -0,0 +1,162 @@
+import hashlib
+from datetime import date, time, timedelta
+from decimal import Decimal
+from time import monotonic
+from uuid import UUID
+
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.autoreload import file_changed
+from django.utils.safestring import mark_safe
+
+from django_components import app_settings
+from django_components.template_cache import LRUCache
+
+KEY_PREFIX = "django_components.fragment"
+
+# Values of these types have a repr that identifies them across processes
+SIMPLE_KEY_TYPES = (str, bytes, int, float, bool, type(None), Decimal, date, time, timedelta, UUID)
+
+
+class Fragment:
+    """The rendered output of a component, with the component classes that were rendered as part of it, so that a
+    cache hit can register them as if the component had been rendered."""
+
+    __slots__ = ("content", "component_classes")
+
+    def __init__(self, content, rendered_components):
+        self.content = str(content)
+        self.component_classes = tuple(rendered_components)
+
+    def __getstate__(self):
+        return self.content, self.component_classes
+
+    def __setstate__(self, state):
+        self.content, self.component_classes = state
+
+    def register(self, rendered_components):
+        for component_class in self.component_classes:
+            rendered_components.add(component_class)
+
+    def render(self):
+        return mark_safe(self.content)
+
+
+class LocalFragmentCache:
+    """In-process LRU cache of fragments whose entries expire after their timeout."""
+
+    def __init__(self, maxsize):
+        self._cache = LRUCache(maxsize=maxsize)
+
+    def get(self, key):
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires, fragment = entry
+        if expires <= monotonic():
+            return None
+        return fragment
+
+    def set(self, key, fragment, timeout):
+        self._cache.set(key, (monotonic() + timeout, fragment))
+
+    def clear(self):
+        self._cache.clear()
+
+    def info(self):
+        return self._cache.info()
+
+
+class DjangoFragmentCache:
+    """Fragment cache that stores fragments in one of the caches configured in the CACHES setting."""
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    def get(self, key):
+        return caches[self.alias].get(key)
+
+    def set(self, key, fragment, timeout):
+        caches[self.alias].set(key, fragment, timeout)
+
+    def clear(self):
+        # Entries in a shared cache expire after their timeout
+        pass
+
+
+_fragment_cache = None
+
+
+def get_fragment_cache():
+    """Return the fragment cache configured by the fragment_cache setting."""
+
+    global _fragment_cache
+    if _fragment_cache is None:
+        if app_settings.FRAGMENT_CACHE is None:
+            _fragment_cache = LocalFragmentCache(maxsize=app_settings.FRAGMENT_CACHE_SIZE)
+        else:
+            _fragment_cache = DjangoFragmentCache(app_settings.FRAGMENT_CACHE)
+    return _fragment_cache
+
+
+def make_fragment_key(component_class, *parts):
+    """Return a cache key for a fragment of component_class that is identified by parts."""
+
+    component_path = "%s.%s" % (component_class.__module__, component_class.__qualname__)
+    digest = hashlib.md5(key_part(parts).encode()).hexdigest()
+    return "%s.%s.%s" % (KEY_PREFIX, component_path, digest)
+
+
+def key_part(value):
+    """Return a string that identifies value in a cache key.
+
+    Model instances are identified by their primary key. Other objects don't have a representation that is stable
+    across processes, so they raise TypeError."""
+
+    if isinstance(value, SIMPLE_KEY_TYPES):
+        return repr(value)
+    if isinstance(value, (list, tuple)):
+        return "[%s]" % ",".join(key_part(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return "{%s}" % ",".join(sorted(key_part(item) for item in value))
+    if isinstance(value, dict):
+        return "{%s}" % ",".join(sorted("%s:%s" % (key_part(k), key_part(v)) for k, v in value.items()))
+    meta = getattr(value, "_meta", None)
+    if meta is not None and getattr(value, "pk", None) is not None:
+        return "<%s:%s>" % (meta.label, key_part(value.pk))
+    raise TypeError(
+        "Can't use %r in a component cache key. Override get_cache_key() on the component to return values that "
+        "identify it." % value
+    )
+
+
+def nodelist_fingerprint(nodelist):
+    """Return the line numbers and source of the tags and text in nodelist, as a nested list.
+
+    The fingerprint is the same in every process that loads the same template source, which ids of nodes are not."""
+
+    fingerprint = []
+    for node in nodelist:
+        token = getattr(node, "token", None)
+        fingerprint.append(type(node).__name__)
+        if token is not None:
+            fingerprint.extend((token.lineno, token.contents))
+        for attr in node.child_nodelists:
+            child_nodelist = getattr(node, attr, None)
+            if child_nodelist:
+                fingerprint.append(nodelist_fingerprint(child_nodelist))
+    return fingerprint
+
+
+@receiver(file_changed, dispatch_uid="django_components_fragment_cache_file_changed")
+def clear_on_file_changed(sender, file_path, **kwargs):
+    if _fragment_cache is not None:
+        _fragment_cache.clear()
+
+
+@receiver(setting_changed, dispatch_uid="django_components_fragment_cache_setting_changed")
+def reset_on_setting_changed(sender, setting, **kwargs):
+    global _fragment_cache
+    if setting in ("CACHES", "COMPONENTS", "TEMPLATES"):
+        _fragment_cache = None
@@ -0,0 +1,124 @@
+import os
+from collections import namedtuple
+from itertools import chain
+
+from django.contrib.staticfiles import finders
+from django.core.exceptions import SuspiciousOperation
+from django.forms import Media
+from django.utils.html import escape
+
+from django_components.bundles import bundle_media, modification_time, rewrite_css_urls
+from django_components.template_cache import LRUCache
+
+StaticFile = namedtuple("StaticFile", ["absolute_path", "mtime", "content"])
+
+# The rendered CSS and JS of some media, and the (absolute path, modification time) of each file inlined or bundled
+# into them
+RenderedDependencies = namedtuple("RenderedDependencies", ["css", "js", "files"])
+
+# Contents of the static files considered for inlining, by path
+static_file_cache = LRUCache(maxsize=256)
+
+
+def get_static_file(path, max_size=None):
+    """Return a static file found by the staticfiles finders, or None if it can't be found or is larger than max_size
+    bytes.
+
+    Files are read once, and read again when their modification time changes. Files that are too large aren't read or
+    kept."""
+
+    static_file = static_file_cache.get(path)
+    if static_file is not None and modification_time(static_file.absolute_path) == static_file.mtime:
+        if max_size is not None and len(static_file.content) > max_size:
+            return None
+        return static_file
+
+    try:
+        absolute_path = finders.find(path)
+        if not absolute_path:
+            return None
+        stat = os.stat(absolute_path)
+        if max_size is not None and stat.st_size > max_size:
+            return None
+        with open(absolute_path, "rb") as f:
+            # The file may have grown since it was checked
+            content = f.read() if max_size is None else f.read(max_size + 1)
+    except (OSError, SuspiciousOperation):
+        return None
+    if max_size is not None and len(content) > max_size:
+        return None
+    static_file = StaticFile(absolute_path, stat.st_mtime_ns, content)
+    static_file_cache.set(path, static_file)
+    return static_file
+
+
+def files_unchanged(files):
+    """Return whether none of the (absolute path, modification time) pairs of inlined or bundled files have changed."""
+
+    return all(modification_time(absolute_path) == mtime for absolute_path, mtime in files)
+
+
+def inlinable_content(path, max_size, end_tag, transform=None):
+    """Return the static file at path and its content as text, if it is small enough to be inlined, or None."""
+
+    if path.startswith(("http://", "https://", "/")):
+        return None
+    static_file = get_static_file(path, max_size)
+    if static_file is None or len(static_file.content) > max_size:
+        return None
+    content = static_file.content
+    if transform is not None:
+        content = transform(path, content)
+        if content is None:
+            return None
+    try:
+        text = content.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+    # The content can't contain the tag that would end it early
+    if end_tag in text.lower():
+        return None
+    return static_file, text
+
+
+def render_inlined_media(media, max_size, bundle=False):
+    """Render media, with the static files of at most max_size bytes in <style> and <script> blocks.
+
+    Other files are linked in their place. If bundle is True, each run of consecutive files that aren't inlined is
+    bundled, so the files keep their order."""
+
+    files = []
+
+    def render_linked(linked_media):
+        if bundle:
+            linked_media = bundle_media(linked_media, files)
+        return chain(linked_media.render_css(), linked_media.render_js())
+
+    css = []
+    for medium, paths in media._css.items():
+        linked = []
+        for path in paths:
+            inlined = inlinable_content(path, max_size, "</style", rewrite_css_urls)
+            if inlined is None:
+                linked.append(path)
+                continue
+            css.extend(render_linked(Media(css={medium: linked})))
+            linked = []
+            static_file, text = inlined
+            files.append((static_file.absolute_path, static_file.mtime))
+            css.append('<style media="%s">%s</style>' % (escape(medium), text))
+        css.extend(render_linked(Media(css={medium: linked})))
+
+    js, linked = [], []
+    for path in media._js:
+        inlined = inlinable_content(path, max_size, "</script")
+        if inlined is None:
+            linked.append(path)
+            continue
+        js.extend(render_linked(Media(js=linked)))
+        linked = []
+        static_file, text = inlined
+        files.append((static_file.absolute_path, static_file.mtime))
+        js.append("<script>%s</script>" % text)
+    js.extend(render_linked(Media(js=linked)))
+    return RenderedDependencies("".join(css), "".join(js), tuple(files))
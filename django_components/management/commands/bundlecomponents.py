@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from django_components.bundles import bundle_media
+from django_components.component import NotRegistered, registry
+from django_components.middleware import join_media
+
+
+class Command(BaseCommand):
+    help = ("Build the CSS and JS bundles of sets of components, so that pages that render them don't have to. "
+            "Bundles are built for the components in the order they are given, which should be the order they are "
+            "first rendered in on a page.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("component_sets", nargs="+", metavar="name,name,...",
+                            help="Comma-separated names of the components rendered on a page.")
+
+    def handle(self, *args, **options):
+        for component_set in options["component_sets"]:
+            names = [name for name in component_set.split(",") if name]
+            try:
+                component_classes = [registry.get(name) for name in names]
+            except NotRegistered as e:
+                raise CommandError(str(e))
+            media = bundle_media(join_media(component_classes))
+            self.stdout.write("%s:\n%s" % (", ".join(names), "\n".join(media.render())))
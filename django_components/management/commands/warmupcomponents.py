@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from django_components.warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = "Load and compile the templates of all registered components."
+
+    def handle(self, *args, **options):
+        result = warm_up()
+        for name, error in result.errors:
+            self.stderr.write(self.style.WARNING("Could not warm up component '%s': %r" % (name, error)))
+        self.stdout.write(self.style.SUCCESS("Warmed up %d templates for %d components in %.3f s." % (
+            result.templates, result.components, result.duration)))
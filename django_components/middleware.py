@@ -1,53 +1,110 @@
 import re
 
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.forms import Media
 
+from django_components import app_settings
+from django_components.bundles import bundle_media
+from django_components.component import get_media
+from django_components.inline_dependencies import RenderedDependencies, files_unchanged, render_inlined_media
+from django_components.template_cache import LRUCache
+
 RENDERED_COMPONENTS_CONTEXT_KEY = "_COMPONENT_DEPENDENCIES"
+RENDERED_COMPONENTS_REQUEST_ATTRIBUTE = "_component_dependencies"
 CSS_DEPENDENCY_PLACEHOLDER = '<link name="CSS_PLACEHOLDER" href="#">'
 JS_DEPENDENCY_PLACEHOLDER = '<src name="JS_PLACEHOLDER" href="#">'
 
 SCRIPT_TAG_REGEX = re.compile('<script')
 
 
+class ComponentDependencies:
+    """Component classes rendered while producing a response, in the order they were first rendered.
+
+    Components are recorded by class, so its size depends on the number of distinct components on a page rather than
+    the number of times they were rendered."""
+
+    __slots__ = ("component_classes",)
+
+    def __init__(self):
+        self.component_classes = {}
+
+    def add(self, component_class):
+        self.component_classes[component_class] = None
+
+    def __iter__(self):
+        return iter(self.component_classes)
+
+    def __len__(self):
+        return len(self.component_classes)
+
+
 class ComponentDependencyMiddleware:
     """Middleware that inserts CSS/JS dependencies for all rendered components at points marked with template tags."""
 
-    dependency_regex = re.compile(bytes('{}|{}'.format(CSS_DEPENDENCY_PLACEHOLDER, JS_DEPENDENCY_PLACEHOLDER),
-                                        encoding='utf-8'))
-
     def __init__(self, get_response):
         self.get_response = get_response
         self.import_scripts_as_modules = getattr(settings, 'IMPORT_SCRIPTS_AS_MODULES', False)
 
     def __call__(self, request):
-        return self.get_response(request)
+        # Components rendered outside of a TemplateResponse find this set through the component_dependencies
+        # context processor
+        rendered_components = ComponentDependencies()
+        setattr(request, RENDERED_COMPONENTS_REQUEST_ATTRIBUTE, rendered_components)
+
+        response = self.get_response(request)
+        if (response.streaming and app_settings.STREAM_DEPENDENCIES
+                and response.get('Content-Type', '').startswith('text/html')):
+            response.streaming_content = self.stream_dependencies(response.streaming_content, rendered_components)
+        return response
 
     def process_template_response(self, _request, response):
         if response.context_data is None:
             response.context_data = {}
-        response.context_data[RENDERED_COMPONENTS_CONTEXT_KEY] = set()
+        response.context_data[RENDERED_COMPONENTS_CONTEXT_KEY] = ComponentDependencies()
 
         def component_dependency_callback(rendered_response):
             rendered_components = rendered_response.context_data.get(RENDERED_COMPONENTS_CONTEXT_KEY, [])
-            required_media = join_media(rendered_components)
-
-            replacer = DependencyReplacer(''.join(required_media.render_css()), ''.join(required_media.render_js()),
-                                          use_modules=self.import_scripts_as_modules)
-            response.content = re.sub(self.dependency_regex, replacer, response.content)
+            replacer = self.get_replacer(rendered_components)
+            response.content = insert_dependencies(response.content, replacer)
 
         response.add_post_render_callback(component_dependency_callback)
 
         return response
 
+    def get_replacer(self, rendered_components):
+        css, js = render_media(rendered_components)
+        return DependencyReplacer(css, js, use_modules=self.import_scripts_as_modules)
+
+    def stream_dependencies(self, streaming_content, rendered_components):
+        """Insert dependencies into a streamed response.
+
+        Chunks before the first placeholder are passed on as soon as they arrive. The dependencies aren't known until
+        every component on the page has rendered, so chunks from the first placeholder onwards are held until the
+        stream is exhausted, and then sent with the placeholders replaced."""
+
+        parts = split_placeholders(streaming_content)
+        for is_placeholder, data in parts:
+            if is_placeholder:
+                held = [(is_placeholder, data)]
+                break
+            yield data
+        else:
+            return
+
+        held.extend(parts)
+        replacer = self.get_replacer(rendered_components)
+        for is_placeholder, data in held:
+            yield replacer.replace(data) if is_placeholder else data
+
 
 def add_module_attribute_to_scripts(scripts):
     return re.sub(SCRIPT_TAG_REGEX, '<script type="module"', scripts)
 
 
 class DependencyReplacer:
-    """Replacer for use in re.sub that replaces the first placeholder CSS and JS
-    tags it encounters and removes any subsequent ones."""
+    """Replacer that replaces the first placeholder CSS and JS tags it encounters and removes any subsequent ones."""
 
     CSS_PLACEHOLDER = bytes(CSS_DEPENDENCY_PLACEHOLDER, encoding='utf-8')
     JS_PLACEHOLDER = bytes(JS_DEPENDENCY_PLACEHOLDER, encoding='utf-8')
@@ -59,17 +116,142 @@ class DependencyReplacer:
         self.js_string = bytes(js_string, encoding='utf-8')
         self.css_string = bytes(css_string, encoding='utf-8')
 
-    def __call__(self, match):
-        if match[0] == self.CSS_PLACEHOLDER:
+    def replace(self, placeholder):
+        if placeholder == self.CSS_PLACEHOLDER:
             replacement, self.css_string = self.css_string, b""
-        elif match[0] == self.JS_PLACEHOLDER:
+        elif placeholder == self.JS_PLACEHOLDER:
             replacement, self.js_string = self.js_string, b""
         else:
-            raise AssertionError('Invalid match for DependencyReplacer' + match)
+            raise AssertionError('Invalid match for DependencyReplacer: %r' % placeholder)
         return replacement
 
 
+def insert_dependencies(content, replacer):
+    """Replace the dependency placeholders in content, building the result with a single join.
+
+    Every placeholder in content is found, including ones rendered outside of the components' context, like those of
+    render_to_string() snippets, so the first of each kind gets the dependencies and the rest are removed."""
+
+    # Slicing a memoryview doesn't copy, so the only copy of content is made by the join
+    view = memoryview(content)
+    parts = []
+    start = 0
+    for index, placeholder in find_placeholders(content):
+        parts.append(view[start:index])
+        parts.append(replacer.replace(placeholder))
+        start = index + len(placeholder)
+    if not parts:
+        return content
+    parts.append(view[start:])
+    return b"".join(parts)
+
+
+def find_placeholders(data):
+    """Yield the index and value of each placeholder in data, in the order they appear.
+
+    The next occurrence of each kind of placeholder is remembered, so every byte of data is searched once for each
+    kind. That is faster than searching for either kind with a regular expression."""
+
+    css_placeholder, js_placeholder = DependencyReplacer.CSS_PLACEHOLDER, DependencyReplacer.JS_PLACEHOLDER
+    css_index, js_index = data.find(css_placeholder), data.find(js_placeholder)
+    while css_index != -1 or js_index != -1:
+        if js_index == -1 or (css_index != -1 and css_index < js_index):
+            yield css_index, css_placeholder
+            css_index = data.find(css_placeholder, css_index + len(css_placeholder))
+        else:
+            yield js_index, js_placeholder
+            js_index = data.find(js_placeholder, js_index + len(js_placeholder))
+
+
+def split_placeholders(chunks):
+    """Split a stream of byte chunks into (is_placeholder, data) pairs.
+
+    Placeholders that are split across chunk boundaries are reassembled. Only the end of a chunk that could be the
+    start of a placeholder is held back until the next chunk arrives."""
+
+    pending = b""
+    for chunk in chunks:
+        data = pending + chunk if pending else chunk
+        start = 0
+        for index, placeholder in find_placeholders(data):
+            if index > start:
+                yield False, data[start:index]
+            yield True, placeholder
+            start = index + len(placeholder)
+
+        end = partial_placeholder_start(data, start)
+        if end > start:
+            yield False, data[start:end]
+        pending = data[end:]
+    if pending:
+        yield False, pending
+
+
+def partial_placeholder_start(data, start):
+    """Return the index where a trailing, incomplete placeholder begins in data, or len(data) if there is none."""
+
+    # Both placeholders contain a single "<", so only the last one in data can start a partial placeholder
+    index = data.rfind(b"<", start)
+    if index != -1:
+        tail = data[index:]
+        if DependencyReplacer.CSS_PLACEHOLDER.startswith(tail) or DependencyReplacer.JS_PLACEHOLDER.startswith(tail):
+            return index
+    return len(data)
+
+
 def join_media(components):
-    """Return combined media object for iterable of components."""
+    """Return combined media object for iterable of components or component classes.
+
+    Each component class contributes its media once. The media lists are concatenated in a single pass and merged
+    once when the result is rendered, instead of re-merging the accumulated lists for every component."""
+
+    combined = Media()
+    for component_class in unique_classes(components):
+        media = get_media(component_class)
+        combined._css_lists.extend(media._css_lists)
+        combined._js_lists.extend(media._js_lists)
+    return combined
+
+
+def unique_classes(components):
+    """Return the distinct classes of an iterable of components or component classes, in first-seen order."""
+
+    return tuple(dict.fromkeys(component if isinstance(component, type) else type(component)
+                               for component in components))
+
+
+# Rendered CSS and JS strings, keyed by the component classes whose media they contain
+rendered_media_cache = LRUCache(maxsize=256)
+
+
+def render_media(components):
+    """Return the rendered CSS and JS of the combined media of components.
+
+    Pages that render the same component classes in the same order share the result, so they skip merging media
+    altogether. With the bundle_dependencies setting on, the result refers to bundles of the media files, which are
+    built the first time a set of component classes is rendered. With inline_dependencies_max_size set, small files
+    are inlined. With DEBUG on, the result is rendered again when one of the inlined or bundled files changes."""
+
+    component_classes = unique_classes(components)
+    rendered = rendered_media_cache.get(component_classes)
+    # Checking the files costs a stat() per file for every response, so it's only done during development
+    if rendered is None or (settings.DEBUG and rendered.files and not files_unchanged(rendered.files)):
+        rendered = render_joined_media(join_media(component_classes))
+        rendered_media_cache.set(component_classes, rendered)
+    return rendered.css, rendered.js
+
+
+def render_joined_media(media):
+    max_size = app_settings.INLINE_DEPENDENCIES_MAX_SIZE
+    if max_size is not None:
+        return render_inlined_media(media, max_size, bundle=app_settings.BUNDLE_DEPENDENCIES)
+    files = []
+    if app_settings.BUNDLE_DEPENDENCIES:
+        media = bundle_media(media, files)
+    return RenderedDependencies(''.join(media.render_css()), ''.join(media.render_js()), tuple(files))
+
 
-    return sum([component.media for component in components], Media())
+@receiver(setting_changed, dispatch_uid="django_components_rendered_media_setting_changed")
+def clear_rendered_media_on_setting_changed(sender, setting, **kwargs):
+    if setting in ("STATIC_URL", "STATIC_ROOT", "STATICFILES_STORAGE", "STATICFILES_DIRS", "COMPONENTS"):
+        rendered_media_cache.clear()
@@ -0,0 +1,75 @@
+import re
+
+from django.template import Template
+from django.template.base import TextNode
+
+# Text whose whitespace is significant: the content of elements that are rendered as they are written, and quoted
+# attribute values
+PRESERVED_START_REGEX = re.compile(
+    r"""<(?P<tag>pre|textarea|script|style)(?=[\s/>])|[^\s"'<>/=]+\s*=\s*(?P<quote>["'])""", re.IGNORECASE
+)
+WHITESPACE_REGEX = re.compile(r"\s+")
+
+
+def collapse_whitespace(match):
+    return "\n" if "\n" in match.group() else " "
+
+
+class WhitespaceCollapser:
+    """Collapse each run of whitespace in HTML to a single newline, if it contains one, or space.
+
+    The content of <pre>, <textarea>, <script> and <style> elements, and quoted attribute values, are left alone. Text
+    is passed in the order it appears in the template, so that one of them that is opened in one text node is left
+    alone until the text node that closes it."""
+
+    def __init__(self):
+        self.preserved_end = None
+
+    def collapse(self, text):
+        parts = []
+        position = 0
+        while position < len(text):
+            if self.preserved_end is not None:
+                end = self.preserved_end.search(text, position)
+                if end is None:
+                    parts.append(text[position:])
+                    break
+                parts.append(text[position:end.end()])
+                position = end.end()
+                self.preserved_end = None
+                continue
+
+            start = PRESERVED_START_REGEX.search(text, position)
+            if start is None:
+                parts.append(WHITESPACE_REGEX.sub(collapse_whitespace, text[position:]))
+                break
+            parts.append(WHITESPACE_REGEX.sub(collapse_whitespace, text[position:start.start()]))
+            parts.append(start.group())
+            position = start.end()
+            if start.group("tag"):
+                self.preserved_end = re.compile(r"</%s\s*>" % start.group("tag"), re.IGNORECASE)
+            else:
+                self.preserved_end = re.compile(start.group("quote"))
+        return "".join(parts)
+
+
+def minify_template(template):
+    """Return a copy of a compiled template whose text has insignificant whitespace collapsed.
+
+    The template is compiled again from its source, so the template that other templates load isn't changed. Text
+    that comes from variables, included templates or parent templates isn't minified."""
+
+    minified = Template(template.source, template.origin, template.name, template.engine)
+    collapse_nodelist(minified.nodelist, WhitespaceCollapser())
+    return minified
+
+
+def collapse_nodelist(nodelist, collapser):
+    # Imported here because the component module imports this one
+    from django_components.component import child_nodelists
+
+    for node in nodelist:
+        if isinstance(node, TextNode):
+            node.s = collapser.collapse(node.s)
+        for _, child_nodelist in child_nodelists(node):
+            collapse_nodelist(child_nodelist, collapser)
@@ -0,0 +1,182 @@
+import json
+import logging
+import re
+import threading
+from contextlib import contextmanager
+
+from django_components.signals import component_post_render, component_pre_render
+
+logger = logging.getLogger(__name__)
+
+# Characters that can't be used in the name of a Server-Timing metric
+METRIC_NAME_REGEX = re.compile(r"[^!#$%&'*+.^_`|~0-9A-Za-z-]")
+
+
+class ProfileEntry:
+    """A single render of a component, and the renders of the components nested in it."""
+
+    __slots__ = ("name", "context_time", "render_time", "size", "cache_hit", "children")
+
+    def __init__(self, name):
+        self.name = name
+        self.context_time = self.render_time = 0.0
+        self.size = self.cache_hit = None
+        self.children = []
+
+    @property
+    def total_time(self):
+        return self.context_time + self.render_time
+
+    @property
+    def self_time(self):
+        """Time spent in this render, excluding the renders of nested components."""
+
+        return self.total_time - sum(child.total_time for child in self.children)
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "context_ms": round(self.context_time * 1000, 3),
+            "render_ms": round(self.render_time * 1000, 3),
+            "size": self.size,
+            "cache_hit": self.cache_hit,
+            "children": [child.as_dict() for child in self.children],
+        }
+
+
+class ComponentProfile:
+    """Timing tree of the components rendered while the profile is active."""
+
+    def __init__(self):
+        self.roots = []
+        self._stack = []
+
+    def start(self, name):
+        entry = ProfileEntry(name)
+        self._stack.append(entry)
+
+    def finish(self, context_time, render_time, size, cache_hit, pending):
+        if not self._stack:
+            return
+        entry = self._stack.pop()
+        if pending:
+            # The component is rendered again, with complete output, by the next pass of an async render
+            return
+        entry.context_time, entry.render_time, entry.size, entry.cache_hit = context_time, render_time, size, cache_hit
+        siblings = self._stack[-1].children if self._stack else self.roots
+        siblings.append(entry)
+
+    def entries(self):
+        """Yield every entry in the tree, parents before their children."""
+
+        stack = list(reversed(self.roots))
+        while stack:
+            entry = stack.pop()
+            yield entry
+            stack.extend(reversed(entry.children))
+
+    def totals(self):
+        """Return (name, number of renders, seconds spent) for each component, slowest first.
+
+        Time spent in nested components is only counted for the nested component, so the totals add up to the time
+        spent rendering components."""
+
+        totals = {}
+        for entry in self.entries():
+            count, duration = totals.get(entry.name, (0, 0.0))
+            totals[entry.name] = (count + 1, duration + entry.self_time)
+        return sorted(((name, count, duration) for name, (count, duration) in totals.items()),
+                      key=lambda total: total[2], reverse=True)
+
+    def as_list(self):
+        return [entry.as_dict() for entry in self.roots]
+
+    def to_json(self, **kwargs):
+        """Return the timing tree as JSON. Times are in milliseconds."""
+
+        return json.dumps(self.as_list(), **kwargs)
+
+    def server_timing(self, limit=None):
+        """Return the time spent in each component as the value of a Server-Timing header."""
+
+        metrics = []
+        for name, count, duration in self.totals()[:limit]:
+            metrics.append('%s;dur=%.3f;desc="%s"' % (
+                METRIC_NAME_REGEX.sub("-", name) or "-", duration * 1000,
+                "%s x%d" % (name.replace("\\", "\\\\").replace('"', '\\"'), count),
+            ))
+        return ", ".join(metrics)
+
+
+_local = threading.local()
+_lock = threading.Lock()
+_active_profiles = 0
+
+
+def current_profile():
+    """Return the profile that components rendered by this thread are recorded in, or None."""
+
+    return getattr(_local, "profile", None)
+
+
+@contextmanager
+def profile_components():
+    """Record the components rendered by this thread inside the block in a new ComponentProfile.
+
+    The render signals only have receivers while a profile is active, so components aren't timed otherwise."""
+
+    global _active_profiles
+    profile = ComponentProfile()
+    previous = current_profile()
+    _local.profile = profile
+    with _lock:
+        if _active_profiles == 0:
+            component_pre_render.connect(record_pre_render, dispatch_uid="django_components_profile_pre_render")
+            component_post_render.connect(record_post_render, dispatch_uid="django_components_profile_post_render")
+        _active_profiles += 1
+    try:
+        yield profile
+    finally:
+        _local.profile = previous
+        with _lock:
+            _active_profiles -= 1
+            if _active_profiles == 0:
+                component_pre_render.disconnect(dispatch_uid="django_components_profile_pre_render")
+                component_post_render.disconnect(dispatch_uid="django_components_profile_post_render")
+
+
+def record_pre_render(sender, name, **kwargs):
+    profile = current_profile()
+    if profile is not None:
+        profile.start(name)
+
+
+def record_post_render(sender, context_time, render_time, size, cache_hit, pending, **kwargs):
+    profile = current_profile()
+    if profile is not None:
+        profile.finish(context_time, render_time, size, cache_hit, pending)
+
+
+class ComponentProfilerMiddleware:
+    """Middleware that times the components rendered for each request.
+
+    The profile is available to views as request.component_profile, is added to the response as a Server-Timing
+    header, and is logged as JSON to the django_components.profiling logger at DEBUG level. Streamed responses are
+    rendered after the middleware returns, so their components aren't included."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with profile_components() as profile:
+            request.component_profile = profile
+            response = self.get_response(request)
+
+        if profile.roots:
+            server_timing = profile.server_timing()
+            if response.has_header("Server-Timing"):
+                server_timing = response["Server-Timing"] + ", " + server_timing
+            response["Server-Timing"] = server_timing
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Components rendered for %s: %s", request.path, profile.to_json())
+        return response
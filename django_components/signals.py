@@ -0,0 +1,23 @@
+from django.dispatch import Signal
+
+# Sent before a component is rendered, with sender set to the component class and these arguments:
+#   name: the name the component is registered under
+#   component: the component instance that is rendered
+component_pre_render = Signal()
+
+# Sent after a component has been rendered, with sender set to the component class and these arguments:
+#   name: the name the component is registered under
+#   component: the component instance that was rendered
+#   context_time: seconds spent in the component's context() method
+#   render_time: seconds spent rendering the component's template, including the components nested in it
+#   size: length of the rendered output, or None if rendering raised an exception
+#   cache_hit: whether the output came from the fragment cache, or None if the component isn't cached
+#   pending: True if the output is incomplete because async contexts are still being fetched, and the component will
+#       be rendered again once they are available
+component_post_render = Signal()
+
+
+def is_enabled():
+    """Return whether anything listens to the render signals. Components are only timed while something does."""
+
+    return bool(component_pre_render.receivers or component_post_render.receivers)
@@ -0,0 +1,101 @@
+from collections import OrderedDict, namedtuple
+from threading import RLock
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.autoreload import file_changed
+
+from django_components import app_settings
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe mapping that evicts the least recently used entry once maxsize is reached.
+
+    A maxsize of None means the cache is unbounded."""
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = RLock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+
+    def get_or_set(self, key, default_func):
+        """Return the value stored for key, calling default_func() to create and store it on a miss."""
+
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = default_func()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
+class ComponentTemplateCache(LRUCache):
+    """Process-wide cache of compiled component templates.
+
+    Entries are keyed by (component class, template name), so every usage of a component shares a single compiled
+    template regardless of which ComponentNode rendered it and which slots it filled.
+
+    The generation counter is incremented whenever the cache is cleared, so that callers holding on to a compiled
+    template can tell when it has gone stale."""
+
+    def __init__(self):
+        super().__init__(maxsize=app_settings.TEMPLATE_CACHE_SIZE)
+        self.generation = 0
+
+    def clear(self):
+        with self._lock:
+            super().clear()
+            self.maxsize = app_settings.TEMPLATE_CACHE_SIZE
+            self.generation += 1
+
+
+template_cache = ComponentTemplateCache()
+
+
+@receiver(file_changed, dispatch_uid="django_components_template_cache_file_changed")
+def clear_on_file_changed(sender, file_path, **kwargs):
+    template_cache.clear()
+
+
+@receiver(setting_changed, dispatch_uid="django_components_template_cache_setting_changed")
+def clear_on_setting_changed(sender, setting, **kwargs):
+    if setting in ("TEMPLATES", "COMPONENTS"):
+        template_cache.clear()
@@ -0,0 +1,231 @@
+import copyreg
+import hashlib
+import mmap
+import os
+import pickle
+import sys
+import tempfile
+from types import MappingProxyType
+
+import django
+from django.template import Origin, Template, TemplateDoesNotExist
+from django.template.engine import Engine
+from django.template.loaders import cached
+from django.template.loaders.base import Loader as BaseLoader
+from django.template.smartif import OPERATORS
+
+from django_components import app_settings
+from django_components.component import EMPTY_MAPPING, ComponentBinding, registry
+from django_components.component_registry import NotRegistered
+from django_components.templatetags.component_tags import (
+    ComponentArguments, ComponentMapNode, ComponentNode, SlotNode, slot_names,
+)
+
+# Classes of {% if %} operators are created inside a function, so pickle can't find them by name
+OPERATOR_CLASSES = {operator_class: key for key, operator_class in OPERATORS.items()}
+
+
+def package_version():
+    """Return the version of the installed django-components distribution, or None if it isn't installed."""
+
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+    except ImportError:
+        # Python 3.7 and earlier
+        import pkg_resources
+
+        try:
+            return pkg_resources.get_distribution("django_components").version
+        except pkg_resources.DistributionNotFound:
+            return None
+    try:
+        return version("django_components")
+    except PackageNotFoundError:
+        return None
+
+
+VERSION = package_version()
+
+# The attributes that the pickled classes of this library store, so that templates stored by a build that stored
+# different ones aren't loaded, even when the version hasn't changed
+NODE_LAYOUT = [
+    (cls.__qualname__, slot_names(cls)) for cls in (ComponentNode, ComponentMapNode, SlotNode, ComponentArguments)
+]
+
+
+def make_operator(key, first, second):
+    operator = OPERATORS[key]()
+    operator.first, operator.second = first, second
+    return operator
+
+
+def reduce_operator(operator):
+    return make_operator, (OPERATOR_CLASSES[type(operator)], operator.first, operator.second)
+
+
+def make_mapping_proxy(items):
+    return MappingProxyType(items) if items else EMPTY_MAPPING
+
+
+def reduce_mapping_proxy(proxy):
+    return make_mapping_proxy, (dict(proxy),)
+
+
+class TemplatePickler(pickle.Pickler):
+    """Pickler for the nodes of a compiled template, that refers to the engine and origin of the template instead
+    of including them.
+
+    Components are stored by the name they were registered under, and get the class that is registered under that
+    name when the template is loaded."""
+
+    dispatch_table = copyreg.dispatch_table.copy()
+    dispatch_table.update((operator_class, reduce_operator) for operator_class in OPERATOR_CLASSES)
+    dispatch_table[MappingProxyType] = reduce_mapping_proxy
+
+    def persistent_id(self, obj):
+        if isinstance(obj, Engine):
+            return ("engine",)
+        if isinstance(obj, Origin):
+            return ("origin", obj.name, obj.template_name)
+        if isinstance(obj, ComponentBinding):
+            return ("component", obj.component_name, obj.slots)
+        return None
+
+
+class TemplateUnpickler(pickle.Unpickler):
+    def __init__(self, file, engine, origin):
+        super().__init__(file)
+        self.engine, self.origin = engine, origin
+
+    def persistent_load(self, pid):
+        if pid[0] == "engine":
+            return self.engine
+        if pid[0] == "origin":
+            name, template_name = pid[1:]
+            if name == self.origin.name:
+                return self.origin
+            return Origin(name, template_name)
+        if pid[0] == "component":
+            name, slots = pid[1:]
+            return ComponentBinding(registry.get(name), name, slots)
+        raise pickle.UnpicklingError("Unknown persistent id %r" % (pid,))
+
+
+class TemplateStore:
+    """Directory of compiled templates, keyed by a hash of their source and of everything else that affects how
+    they are compiled.
+
+    Each template is stored in its own file, which is written atomically, so processes can share a store and
+    write to it at the same time. Stored templates are read through mmap, so processes that load the same template
+    share the pages of the file."""
+
+    def __init__(self, directory, version=""):
+        self.directory = directory
+        self.version = version
+
+    def key(self, source, engine):
+        """Return the key of a template with source, compiled by engine."""
+
+        key = hashlib.sha256()
+        for part in (VERSION, NODE_LAYOUT, django.get_version(), "%d.%d" % sys.version_info[:2], self.version,
+                     engine.debug, engine.builtins, sorted(engine.libraries.items()), source):
+            key.update(repr(part).encode())
+            key.update(b"\0")
+        return key.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".pickle")
+
+    def load(self, key, engine, origin):
+        """Return the stored nodelist for key, or None if there isn't one."""
+
+        try:
+            with open(self.path(key), "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return TemplateUnpickler(data, engine, origin).load()
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, NotRegistered):
+            # A missing, empty, truncated or outdated file, or one that uses a component that is no longer registered,
+            # is treated as if there was no stored template
+            return None
+
+    def save(self, key, nodelist):
+        """Store nodelist under key, and return whether it could be stored.
+
+        Templates that use tags whose nodes can't be pickled aren't stored."""
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        except OSError:
+            return False
+        try:
+            with os.fdopen(fd, "wb") as f:
+                TemplatePickler(f, protocol=pickle.HIGHEST_PROTOCOL).dump(nodelist)
+            os.replace(temporary_path, self.path(key))
+            return True
+        except (OSError, pickle.PicklingError, TypeError, AttributeError, RecursionError):
+            os.unlink(temporary_path)
+            return False
+
+
+class PersistentTemplateLoaderMixin(BaseLoader):
+    """Create templates from the template store, and only compile templates that aren't in it yet."""
+
+    def get_template(self, template_name, skip=None):
+        tried = []
+
+        for origin in self.get_template_sources(template_name):
+            if skip is not None and origin in skip:
+                tried.append((origin, 'Skipped'))
+                continue
+
+            try:
+                contents = self.get_contents(origin)
+            except TemplateDoesNotExist:
+                tried.append((origin, 'Source does not exist'))
+                continue
+            else:
+                return self.compile_template(contents, origin)
+
+        raise TemplateDoesNotExist(template_name, tried=tried)
+
+    def compile_template(self, contents, origin):
+        store = get_template_store()
+        if store is None:
+            return Template(contents, origin, origin.template_name, self.engine)
+
+        key = store.key(contents, self.engine)
+        nodelist = store.load(key, self.engine, origin)
+        if nodelist is None:
+            template = Template(contents, origin, origin.template_name, self.engine)
+            store.save(key, template.nodelist)
+            return template
+
+        # Set up the template like Template.__init__() does, without compiling its source
+        template = Template.__new__(Template)
+        template.name, template.origin, template.source, template.engine = (
+            origin.template_name, origin, str(contents), self.engine)
+        template.nodelist = nodelist
+        return template
+
+
+class Loader(cached.Loader, PersistentTemplateLoaderMixin):
+    """Cached template loader that also keeps compiled templates in the template store, so that other processes,
+    and later runs, can load them instead of compiling them again.
+
+    Configure it like Django's cached loader, with the loaders it should load template sources from."""
+
+
+_template_store = None
+
+
+def get_template_store():
+    """Return the store configured by the template_store setting, or None if it isn't set."""
+
+    global _template_store
+    directory = app_settings.TEMPLATE_STORE
+    if directory is None:
+        return None
+    version = app_settings.TEMPLATE_STORE_VERSION
+    if _template_store is None or (_template_store.directory, _template_store.version) != (directory, version):
+        _template_store = TemplateStore(directory, version)
+    return _template_store
@@ -1,15 +1,27 @@
-from collections import defaultdict
+import inspect
+from time import perf_counter
+from types import MappingProxyType
 
 from django import template
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
-from django.template.base import Node, NodeList, TemplateSyntaxError, mark_safe, TokenType
+from django.template.base import (
+    FilterExpression, Node, NodeList, TemplateSyntaxError, TextNode, TokenType, Variable, VariableDoesNotExist,
+)
 from django.template.library import parse_bits
 from django.utils.safestring import mark_safe
 
-from django_components.component import registry
-from django_components.middleware import CSS_DEPENDENCY_PLACEHOLDER, JS_DEPENDENCY_PLACEHOLDER, \
-    RENDERED_COMPONENTS_CONTEXT_KEY
+from django_components import signals
+from django_components.async_rendering import ASYNC_RENDER_CONTEXT_KEY, PENDING
+from django_components.component import (
+    EMPTY_MAPPING, SLOT_TABLE_CONTEXT_KEY, ComponentBinding, OuterContext, find_slot_nodes, get_rendered_media,
+    registry,
+)
+from django_components.fragment_cache import Fragment, get_fragment_cache, make_fragment_key, nodelist_fingerprint
+from django_components.middleware import (
+    CSS_DEPENDENCY_PLACEHOLDER, JS_DEPENDENCY_PLACEHOLDER, RENDERED_COMPONENTS_CONTEXT_KEY, ComponentDependencies,
+)
+from django_components.template_cache import template_cache
 
 register = template.Library()
 
@@ -53,23 +65,71 @@ def component_js_dependencies_tag():
 def do_component(parser, token):
     bits = token.split_contents()
     bits, isolated_context = check_for_isolated_context_keyword(bits)
-    component, context_args, context_kwargs = parse_component_with_args(parser, bits, 'component')
-    return ComponentNode(component, context_args, context_kwargs, isolated_context=isolated_context)
+    binding, arguments = parse_component_with_args(parser, bits, 'component')
+    return ComponentNode(binding, arguments, isolated_context=isolated_context)
 
 
 class SlotNode(Node):
+    __slots__ = ("name", "nodelist", "component", "token", "origin")
+
     def __init__(self, name, nodelist, component=None):
         self.name, self.nodelist, self.component = name, nodelist, component
+        # Set by the parser once the node has been created
+        self.token = self.origin = None
 
     def __repr__(self):
         return "<Slot Node: %s. Contents: %r>" % (self.name, self.nodelist)
 
     def render(self, context):
-        # This method should only be called if a slot tag is used outside of a component.
-        assert self.component is None
+        # Slots filled by a component_block tag are rendered by the slot nodes of the component's template
+        slot_table = context.get(SLOT_TABLE_CONTEXT_KEY)
+        if slot_table is not None:
+            slots, outer_slot_table = slot_table
+            filled_nodelist = slots.get(self.name)
+            if filled_nodelist is not None:
+                if not getattr(filled_nodelist, "contains_slots", True):
+                    return filled_nodelist.render(context)
+                # The filled nodelist belongs to the template the component was used in, so slots inside it are
+                # filled from that template's slot table
+                with context.push({SLOT_TABLE_CONTEXT_KEY: outer_slot_table}):
+                    return filled_nodelist.render(context)
         return self.nodelist.render(context)
 
 
+class FilledSlot(NodeList):
+    """The nodes that a component_block tag fills one of the component's slots with."""
+
+    # Whether the nodes include slots of the template that contains the component_block tag
+    contains_slots = False
+
+
+class SlottedNodeList(NodeList):
+    """Top-level nodelist of a component template, that renders the contents of its slots in place of the slot
+    nodes, so that slots cost no more to render than the nodes they contain."""
+
+    def render(self, context):
+        slot_table = context.get(SLOT_TABLE_CONTEXT_KEY)
+        slots = slot_table[0] if slot_table is not None else EMPTY_MAPPING
+        bits = []
+        append = bits.append
+        for node in self:
+            if not isinstance(node, SlotNode):
+                append(str(node.render_annotated(context)))
+                continue
+            filled_nodelist = slots.get(node.name)
+            if filled_nodelist is None:
+                nodes = node.nodelist
+            elif getattr(filled_nodelist, "contains_slots", True):
+                # The slot node fills them from the slot table of the template the component was used in
+                append(str(node.render_annotated(context)))
+                continue
+            else:
+                nodes = filled_nodelist
+            for slot_content_node in nodes:
+                append(str(slot_content_node.render_annotated(context)))
+        return mark_safe("".join(bits))
+
+
 @register.tag("slot")
 def do_slot(parser, token, component=None):
     bits = token.split_contents()
@@ -84,48 +144,334 @@ def do_slot(parser, token, component=None):
 
 
 class ComponentNode(Node):
-    def __init__(self, component, context_args, context_kwargs, slots=None, isolated_context=False):
-        self.context_args = context_args or []
-        self.context_kwargs = context_kwargs or {}
-        self.component, self.isolated_context = component, isolated_context
-        slot_dict = defaultdict(NodeList)
+    # Large templates contain thousands of these. Node doesn't define __slots__, so instances still have a __dict__,
+    # but as the parser only sets attributes that have a slot, it is never created
+    __slots__ = ("binding", "arguments", "isolated_context", "has_async_context", "_render_plan",
+                 "_slots_cache_key", "_static_context", "token", "origin")
+
+    def __init__(self, binding, arguments, slots=None, isolated_context=False):
+        self.binding, self.arguments, self.isolated_context = binding, arguments, isolated_context
         if slots:
+            slot_dict = {}
             for slot in slots:
-                slot_dict[slot.name].extend(slot.nodelist)
-        self.component.slots = slot_dict
+                slot_dict.setdefault(slot.name, FilledSlot()).extend(slot.nodelist)
+            for filled_slot in slot_dict.values():
+                filled_slot.contains_slots = any(True for _ in find_slot_nodes(filled_slot, ()))
+            self.binding.slots = slot_dict
+        self.has_async_context = inspect.iscoroutinefunction(binding.component_class.context)
+        self._render_plan = (None, None, None)
+        self._slots_cache_key = self._static_context = None
+        # Set by the parser once the node has been created
+        self.token = self.origin = None
 
     def __repr__(self):
-        return "<Component Node: %s. Contents: %r>" % (self.component, self.component.instance_template.nodelist)
+        return "<Component Node: %s. Contents: %r>" % (self.binding.component_name, self.binding.slots)
+
+    def __getstate__(self):
+        state = {name: getattr(self, name) for name in slot_names(type(self)) if hasattr(self, name)}
+        # Render plans belong to the process that compiled them, and contexts may not be picklable
+        state["_render_plan"] = (None, None, None)
+        state["_static_context"] = None
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        # The component class is the one registered when the node is loaded, not necessarily the one it was stored with
+        self.has_async_context = inspect.iscoroutinefunction(self.binding.component_class.context)
+
+    def get_render_plan(self, component, template_name):
+        """Return the compiled render plan for this node, remembering the last one used so that repeated renders
+        skip the shared cache entirely."""
+
+        cached_template_name, generation, plan = self._render_plan
+        if cached_template_name != template_name or generation != template_cache.generation:
+            generation = template_cache.generation
+            plan = component.compile_instance_template(template_name)
+            if component.slots:
+                component.check_slots(plan)
+            self._render_plan = (template_name, generation, plan)
+        return plan
 
     def render(self, context):
-        self.component.outer_context = context.flatten()
+        component, rendered_components_set = self.prepare_component(context)
+        args, kwargs = self.arguments.resolve(context)
+        if signals.is_enabled():
+            return self.render_instrumented(component, context, args, kwargs, rendered_components_set)
+        if component.cache_timeout is None:
+            return self.render_component(component, context, args, kwargs, rendered_components_set)
+        return self.render_cached(component, context, args, kwargs, rendered_components_set)
+
+    def prepare_component(self, context):
+        """Return a new instance of the component to render, and the set that rendered components are registered in."""
+
+        # The node is shared by every render, including concurrent renders of a cached template, so per-render state
+        # goes on an instance of its own
+        component = self.binding.create()
+        if component.uses_outer_context:
+            component.outer_context = OuterContext(context)
 
         if RENDERED_COMPONENTS_CONTEXT_KEY in context:
             rendered_components_set = context[RENDERED_COMPONENTS_CONTEXT_KEY]
-            rendered_components_set.add(self.component)
-        elif str(self.component.media) != '' and settings.DEBUG:
+            rendered_components_set.add(self.binding.component_class)
+        elif settings.DEBUG and get_rendered_media(type(component)).has_media:
             raise ImproperlyConfigured('component_dependencies context processor must be '
                                        'used for components that have Media')
         else:
             rendered_components_set = None
+        return component, rendered_components_set
+
+    def render_instrumented(self, component, context, args, kwargs, rendered_components_set):
+        """Render the component, timing it and sending the render signals around it."""
+
+        component_class, name = type(component), component.component_name
+        signals.component_pre_render.send(sender=component_class, name=name, component=component)
+        timing = RenderTiming()
+        async_render = context.get(ASYNC_RENDER_CONTEXT_KEY)
+        fetch_count = async_render.fetch_count if async_render is not None else 0
+        rendered = None
+        start = perf_counter()
+        try:
+            if component.cache_timeout is None:
+                rendered = self.render_component(component, context, args, kwargs, rendered_components_set, timing)
+            else:
+                rendered = self.render_cached(component, context, args, kwargs, rendered_components_set, timing)
+            return rendered
+        finally:
+            signals.component_post_render.send(
+                sender=component_class, name=name, component=component, context_time=timing.context_time,
+                render_time=perf_counter() - start - timing.context_time_spent,
+                size=None if rendered is None else len(rendered), cache_hit=timing.cache_hit,
+                pending=async_render is not None and async_render.fetch_count != fetch_count,
+            )
 
-        # Resolve FilterExpressions and Variables that were passed as args to the component, then call component's
-        # context method to get values to insert into the context
-        resolved_context_args = [safe_resolve(arg, context) for arg in self.context_args]
-        resolved_context_kwargs = {
-            key: safe_resolve(kwarg, context) for key, kwarg in self.context_kwargs.items()
-        }
-        component_context = self.component.context(*resolved_context_args, **resolved_context_kwargs)
+    def render_cached(self, component, context, args, kwargs, rendered_components_set, timing=None):
+        if self.slots_cache_key is False:
+            # The key can't identify what the filled slots render, so the output isn't cached
+            return self.render_component(component, context, args, kwargs, rendered_components_set, timing)
+
+        fragment_cache = get_fragment_cache()
+        cache_key = self.get_fragment_cache_key(component, context, args, kwargs)
+        fragment = fragment_cache.get(cache_key)
+        if timing is not None:
+            timing.cache_hit = fragment is not None
+        if fragment is None:
+            # Record the components rendered inside this one separately, so that cache hits can register them too
+            fragment_components = ComponentDependencies()
+            async_render = context.get(ASYNC_RENDER_CONTEXT_KEY)
+            fetch_count = async_render.fetch_count if async_render is not None else 0
+            content = self.render_component(component, context, args, kwargs, fragment_components, timing)
+            fragment = Fragment(content, fragment_components)
+            # Output that is missing components whose async context is still being fetched isn't cached
+            if async_render is None or async_render.fetch_count == fetch_count:
+                fragment_cache.set(cache_key, fragment, component.cache_timeout)
+
+        if rendered_components_set is not None:
+            fragment.register(rendered_components_set)
+        return fragment.render()
+
+    def render_component(self, component, context, args, kwargs, rendered_components_set, timing=None):
+        async_render = context.get(ASYNC_RENDER_CONTEXT_KEY)
+        if async_render is None:
+            if timing is None:
+                component_context = self.get_component_context(component, args, kwargs)
+            else:
+                start = perf_counter()
+                component_context = self.get_component_context(component, args, kwargs)
+                timing.context_time = timing.context_time_spent = perf_counter() - start
+            return self.render_template(component, context, component_context, rendered_components_set)
+
+        key = async_render.key(self)
+        if timing is None:
+            component_context = async_render.get_context(key, component, args, kwargs, self.has_async_context)
+        else:
+            start = perf_counter()
+            component_context = async_render.get_context(key, component, args, kwargs, self.has_async_context)
+            # Async contexts are awaited between passes, and contexts of earlier passes are remembered, so only the
+            # time of a context() called just now was part of this render
+            timing.context_time_spent = perf_counter() - start
+            timing.context_time = async_render.context_times.get(key, 0.0)
+        if component_context is PENDING:
+            # Rendered by a later pass of the async render, once the context has been fetched
+            return ""
+        with async_render.scope(key):
+            return self.render_template(component, context, component_context, rendered_components_set, async_render)
+
+    def get_component_context(self, component, args, kwargs):
+        """Call component's context method to get values to insert into the context."""
+
+        if self._static_context is not None:
+            return self._static_context
+        if self.has_async_context:
+            # Imported here because asgiref is only installed with Django 3.0 and later
+            from asgiref.sync import async_to_sync
+            component_context = async_to_sync(component.context)(*args, **kwargs)
+        else:
+            component_context = component.context(*args, **kwargs)
+        if component.pure_context and self.arguments.is_literal:
+            # Rendering the context pushes a copy of it, so renders can share it
+            self._static_context = component_context
+        return component_context
 
-        # Create a fresh context if requested
+    def render_template(self, component, context, component_context, rendered_components_set, async_render=None):
         if self.isolated_context:
-            context = context.new()
+            return self.render_isolated(component, context, component_context, rendered_components_set, async_render)
+
+        with context.update(component_context):
             # Insert a reference to the rendered component set so that child components can register themselves
             if rendered_components_set is not None:
                 context[RENDERED_COMPONENTS_CONTEXT_KEY] = rendered_components_set
+            plan = self.get_render_plan(component, component.template(context))
+            # Slots in templates that the component's template includes or extends mustn't see the fills of the
+            # component that this one is rendered in
+            context[SLOT_TABLE_CONTEXT_KEY] = component.slot_table(context) if plan.has_slots else None
+            return plan.render(context)
+
+    def render_isolated(self, component, context, component_context, rendered_components_set, async_render=None):
+        """Render the component in a context that only contains its own context and the state of the render."""
+
+        values = dict(component_context)
+        if rendered_components_set is not None:
+            values[RENDERED_COMPONENTS_CONTEXT_KEY] = rendered_components_set
+        if async_render is not None:
+            values[ASYNC_RENDER_CONTEXT_KEY] = async_render
+        isolated_context = new_isolated_context(context, values)
+        plan = self.get_render_plan(component, component.template(isolated_context))
+        if plan.has_slots:
+            values[SLOT_TABLE_CONTEXT_KEY] = component.slot_table(context)
+        return plan.render(isolated_context)
+
+    def get_fragment_cache_key(self, component, context, args, kwargs):
+        vary_on = [resolve_variable(name, context) for name in component.cache_vary_on]
+        return make_fragment_key(type(component), self.isolated_context, self.slots_cache_key,
+                                 component.get_cache_key(*args, **kwargs), vary_on)
+
+    @property
+    def slots_cache_key(self):
+        """Return a key that identifies the slots filled by this node in any process, or None if it fills none.
+
+        Slots that contain variables or tags render differently in different contexts, and return False."""
+
+        if not self.binding.slots:
+            return None
+        if self._slots_cache_key is None:
+            if not all(isinstance(node, TextNode) for nodelist in self.binding.slots.values() for node in nodelist):
+                self._slots_cache_key = False
+                return False
+            self._slots_cache_key = [
+                getattr(self.origin, "name", None),
+                getattr(self.token, "lineno", None),
+                sorted((name, nodelist_fingerprint(nodelist)) for name, nodelist in self.binding.slots.items()),
+            ]
+        return self._slots_cache_key
+
+
+class RenderTiming:
+    """What an instrumented render of a component measured, besides its total time.
+
+    context_time is the time the component's context() took, and context_time_spent the part of it that was spent
+    during this render."""
+
+    __slots__ = ("context_time", "context_time_spent", "cache_hit")
+
+    def __init__(self):
+        self.context_time = self.context_time_spent = 0.0
+        self.cache_hit = None
+
+
+@register.tag("component_map")
+def do_component_map(parser, token):
+    """
+    To render a component once for each item in a sequence:
+        {% component_map "name" items as item positional_arg keyword_arg=item.value ... %}
 
-        with context.update(component_context):
-            return self.component.render(context)
+    The arguments are resolved once per item, with the item available under the name given after 'as'. Add 'only'
+    to render each item in an isolated context.
+    """
+
+    bits = token.split_contents()
+    bits, isolated_context = check_for_isolated_context_keyword(bits)
+    if len(bits) < 5 or bits[3] != "as":
+        raise TemplateSyntaxError(
+            "'%s' tag should be called as {%% %s \"name\" items as item ... %%}" % (bits[0], bits[0])
+        )
+
+    sequence = parser.compile_filter(bits[2])
+    loop_variable = bits[4]
+    binding, arguments = parse_component_with_args(parser, bits[:2] + bits[5:], bits[0])
+    return ComponentMapNode(binding, sequence, loop_variable, arguments, isolated_context=isolated_context)
+
+
+class ComponentMapNode(ComponentNode):
+    """Render a component for each item in a sequence.
+
+    Everything that doesn't depend on the item, like registering the component's dependencies, is done once. The
+    items are rendered in a single pair of context frames, whose values are replaced between items."""
+
+    __slots__ = ("sequence", "loop_variable")
+
+    def __init__(self, binding, sequence, loop_variable, arguments, isolated_context=False):
+        super().__init__(binding, arguments, isolated_context=isolated_context)
+        self.sequence, self.loop_variable = sequence, loop_variable
+
+    def __repr__(self):
+        return "<Component Map Node: %s for %s in %s>" % (
+            self.binding.component_name, self.loop_variable, self.sequence)
+
+    def render(self, context):
+        items = self.sequence.resolve(context, ignore_failures=True)
+        if not items:
+            return ""
+
+        component, rendered_components_set = self.prepare_component(context)
+        with context.push() as loop_context:
+            arguments = self.bind_items(component, context, loop_context, items)
+            if signals.is_enabled():
+                rendered = [self.render_instrumented(component, context, args, kwargs, rendered_components_set)
+                            for args, kwargs in arguments]
+            elif component.cache_timeout is not None:
+                rendered = [self.render_cached(component, context, args, kwargs, rendered_components_set)
+                            for args, kwargs in arguments]
+            elif self.has_async_context or ASYNC_RENDER_CONTEXT_KEY in context:
+                rendered = [self.render_component(component, context, args, kwargs, rendered_components_set)
+                            for args, kwargs in arguments]
+            elif self.isolated_context:
+                values = {} if rendered_components_set is None else {
+                    RENDERED_COMPONENTS_CONTEXT_KEY: rendered_components_set}
+                rendered = self.render_items(component, new_isolated_context(context, values), arguments)
+            else:
+                rendered = self.render_items(component, context, arguments)
+        return mark_safe("".join(rendered))
+
+    def bind_items(self, component, context, loop_context, items):
+        """Set the loop variable to each item in turn, and yield the component's arguments for it."""
+
+        # The outer context of each item includes the item
+        outer_context = OuterContext(context) if component.uses_outer_context else None
+        for item in items:
+            loop_context[self.loop_variable] = item
+            if outer_context is not None:
+                component.outer_context = outer_context.new()
+            yield self.arguments.resolve(context)
+
+    def render_items(self, component, context, arguments):
+        """Render the component for each of arguments in a single context frame."""
+
+        slot_table = component.slot_table(context)
+        template_name = plan = None
+        rendered = []
+        with context.push() as component_context:
+            for args, kwargs in arguments:
+                component_context.update(component.context(*args, **kwargs))
+                item_template_name = component.template(context)
+                if item_template_name != template_name:
+                    template_name = item_template_name
+                    plan = self.get_render_plan(component, template_name)
+                component_context[SLOT_TABLE_CONTEXT_KEY] = slot_table if plan.has_slots else None
+                rendered.append(plan.render(context))
+                # Hide this item's values from the arguments of the next one
+                component_context.clear()
+        return rendered
 
 
 @register.tag("component_block")
@@ -147,16 +493,15 @@ def do_component_block(parser, token):
     bits, isolated_context = check_for_isolated_context_keyword(bits)
 
     tag_name, token = next_block_token(parser)
-    component, context_args, context_kwargs = parse_component_with_args(parser, bits, 'component_block')
+    binding, arguments = parse_component_with_args(parser, bits, 'component_block')
 
     slots_filled = NodeList()
     while tag_name != "endcomponent_block":
         if tag_name == "slot":
-            slots_filled += do_slot(parser, token, component=component)
+            slots_filled += do_slot(parser, token, component=binding)
         tag_name, token = next_block_token(parser)
 
-    return ComponentNode(component, context_args, context_kwargs, slots=slots_filled,
-                         isolated_context=isolated_context)
+    return ComponentNode(binding, arguments, slots=slots_filled, isolated_context=isolated_context)
 
 
 def next_block_token(parser):
@@ -218,15 +563,140 @@ def parse_component_with_args(parser, bits, tag_name):
 
     trimmed_component_name = component_name[1: -1]
     component_class = registry.get(trimmed_component_name)
-    component = component_class(trimmed_component_name)
+    binding = ComponentBinding(component_class, trimmed_component_name)
+
+    return binding, ComponentArguments.from_parsed(context_args, context_kwargs)
+
+
+class ComponentArguments:
+    """The arguments of a component tag, sorted at parse time by what it takes to resolve them.
+
+    Literals are resolved once, into the args tuple and the read-only kwargs mapping. Only the other arguments are
+    resolved when the tag is rendered: simple variables with a direct lookup, and expressions that use filters in
+    full. Those are kept as (position or name, FilterExpression, Variable or None) tuples."""
+
+    __slots__ = ("args", "kwargs", "dynamic_args", "dynamic_kwargs")
+
+    def __init__(self, args=(), kwargs=EMPTY_MAPPING, dynamic_args=(), dynamic_kwargs=()):
+        self.args, self.kwargs, self.dynamic_args, self.dynamic_kwargs = args, kwargs, dynamic_args, dynamic_kwargs
+
+    def __repr__(self):
+        return "<Component Arguments: %r %r>" % (self.args, dict(self.kwargs))
+
+    @classmethod
+    def from_parsed(cls, context_args, context_kwargs):
+        """Sort the arguments returned by parse_bits()."""
+
+        if not context_args and not context_kwargs:
+            return NO_ARGUMENTS
+
+        args, dynamic_args = [], []
+        for index, arg in enumerate(context_args):
+            value = literal_value(arg)
+            if value is DYNAMIC:
+                dynamic_args.append((index, arg, simple_variable(arg)))
+                value = None
+            args.append(value)
+
+        kwargs, dynamic_kwargs = {}, []
+        for key, kwarg in context_kwargs.items():
+            value = literal_value(kwarg)
+            if value is DYNAMIC:
+                dynamic_kwargs.append((key, kwarg, simple_variable(kwarg)))
+            else:
+                kwargs[key] = value
+
+        return cls(tuple(args), MappingProxyType(kwargs) if kwargs else EMPTY_MAPPING,
+                   tuple(dynamic_args), tuple(dynamic_kwargs))
+
+    @property
+    def is_literal(self):
+        """Whether the arguments are the same in every context."""
+
+        return not self.dynamic_args and not self.dynamic_kwargs
+
+    def resolve(self, context):
+        """Return the positional and keyword arguments to call the component with in context."""
+
+        args, kwargs = self.args, self.kwargs
+        if self.dynamic_args:
+            args = list(args)
+            for index, expression, variable in self.dynamic_args:
+                args[index] = resolve_argument(expression, variable, context)
+        if self.dynamic_kwargs:
+            kwargs = dict(kwargs)
+            for key, expression, variable in self.dynamic_kwargs:
+                kwargs[key] = resolve_argument(expression, variable, context)
+        return args, kwargs
+
+
+NO_ARGUMENTS = ComponentArguments()
+
+# Returned by literal_value() for arguments that have to be resolved in the context they are rendered in
+DYNAMIC = object()
+
+
+def literal_value(argument):
+    """Return the value of an argument that resolves to the same value in every context, or DYNAMIC."""
+
+    if not isinstance(argument, FilterExpression):
+        return DYNAMIC if hasattr(argument, "resolve") else argument
+    if argument.filters:
+        return DYNAMIC
+    if not isinstance(argument.var, Variable):
+        # Quoted strings are resolved by the parser
+        return argument.var
+    if argument.var.lookups is None and not argument.var.translate:
+        return argument.var.literal
+    return DYNAMIC
+
+
+def simple_variable(argument):
+    """Return the Variable of an argument that is a variable without filters, or None."""
+
+    if isinstance(argument, FilterExpression) and not argument.filters and isinstance(argument.var, Variable):
+        return argument.var
+    return None
+
+
+def resolve_argument(expression, variable, context):
+    if variable is not None:
+        try:
+            return variable.resolve(context)
+        except VariableDoesNotExist:
+            # Let the expression apply the string_if_invalid setting
+            pass
+    return expression.resolve(context)
+
+
+def slot_names(cls):
+    """Return the names of the attributes that instances of cls store in slots."""
+
+    return [name for klass in cls.__mro__ for name in vars(klass).get("__slots__", ())]
+
+
+def new_isolated_context(context, values):
+    """Return a context like context.new(values), whose only frame besides the builtins is the values dict.
+
+    context.new() copies the context and its render context, and pushes values into a frame of their own. The
+    isolated context shares the render context instead: templates rendered with it push and pop a render state of
+    their own, like included templates do."""
 
-    return component, context_args, context_kwargs
+    isolated_context = object.__new__(type(context))
+    isolated_context.__dict__.update(context.__dict__)
+    # Context processors of a RequestContext aren't run again for the isolated context
+    isolated_context.__dict__.pop("_processors_index", None)
+    isolated_context.dicts = [{"True": True, "False": False, "None": None}, values]
+    return isolated_context
 
 
-def safe_resolve(context_item, context):
-    """Resolve FilterExpressions and Variables in context if possible.  Return other items unchanged."""
+def resolve_variable(name, context):
+    """Resolve a variable name, which can use dots to look up attributes, or return None if it doesn't exist."""
 
-    return context_item.resolve(context) if hasattr(context_item, 'resolve') else context_item
+    try:
+        return Variable(name).resolve(context)
+    except VariableDoesNotExist:
+        return None
 
 
 def is_wrapped_in_quotes(s):
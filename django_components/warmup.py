@@ -0,0 +1,34 @@
+from collections import namedtuple
+from time import perf_counter
+
+from django.template import Context
+
+from django_components.component import get_rendered_media, registry
+
+WarmUpResult = namedtuple("WarmUpResult", ["components", "templates", "errors", "duration"])
+
+
+def warm_up(component_registry=None):
+    """Load and compile the template of every registered component, and render its media, so that the first
+    requests a process serves don't have to.
+
+    Component templates are loaded through the template engine, which fills Django's cached loader, and compiled
+    into the component template cache. Components that choose their template from the context can list the names
+    of the templates they use in template_variants. Errors are collected rather than raised, so that one broken
+    component doesn't stop the others from being warmed up."""
+
+    start = perf_counter()
+    component_registry = component_registry or registry
+    components = templates = 0
+    errors = []
+    for name, component_class in component_registry.all().items():
+        components += 1
+        try:
+            component = component_class(name)
+            get_rendered_media(component_class)
+            for template_name in component.template_variants or [component.template(Context())]:
+                component.compile_instance_template(template_name)
+                templates += 1
+        except Exception as e:
+            errors.append((name, e))
+    return WarmUpResult(components, templates, errors, perf_counter() - start)
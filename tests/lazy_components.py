@@ -0,0 +1,6 @@
+from django_components import component
+
+
+class LazyComponent(component.Component):
+    def template(self, context):
+        return "simple_template.html"
@@ -0,0 +1,146 @@
+import asyncio
+from unittest import skipUnless
+from unittest.mock import Mock
+
+from django.template import Context, Template, engines
+
+from .django_test_setup import *  # NOQA
+from django_components import component
+from django_components.async_rendering import AsyncTemplateResponse, render_async
+from django_components.middleware import ComponentDependencyMiddleware
+
+from .testutils import Django30CompatibleSimpleTestCase as SimpleTestCase
+
+try:
+    from asgiref.sync import async_to_sync
+except ImportError:
+    # asgiref is only installed with Django 3.0 and later
+    async_to_sync = None
+
+
+class AsyncComponent(component.Component):
+    # Names of the variables whose contexts have been requested
+    started = []
+
+    async def context(self, variable):
+        AsyncComponent.started.append(variable)
+        await asyncio.sleep(0)
+        return {"variable": variable}
+
+    def template(self, context):
+        return "simple_template.html"
+
+    class Media:
+        js = ["async.js"]
+
+
+class ConcurrentComponent(AsyncComponent):
+    expected = 3
+
+    async def context(self, variable):
+        AsyncComponent.started.append(variable)
+        # Only finishes if the contexts of all components on the page are awaited at the same time
+        for _ in range(100):
+            if len(AsyncComponent.started) >= self.expected:
+                return {"variable": variable}
+            await asyncio.sleep(0)
+        raise AssertionError("Component contexts weren't fetched concurrently")
+
+
+class AsyncSlottedComponent(component.Component):
+    async def context(self):
+        await asyncio.sleep(0)
+        return {}
+
+    def template(self, context):
+        return "slotted_template.html"
+
+
+class SyncComponent(component.Component):
+    calls = 0
+
+    def context(self, variable):
+        SyncComponent.calls += 1
+        return {"variable": variable}
+
+    def template(self, context):
+        return "simple_template.html"
+
+
+def render(source, context=None):
+    template = engines["django"].from_string("{% load component_tags %}" + source)
+    return async_to_sync(render_async)(template, context)
+
+
+@skipUnless(async_to_sync, "asgiref is only installed with Django 3.0 and later")
+class AsyncRenderingTest(SimpleTestCase):
+    components = {
+        "async": AsyncComponent,
+        "concurrent": ConcurrentComponent,
+        "async_slotted": AsyncSlottedComponent,
+        "sync": SyncComponent,
+    }
+
+    def setUp(self):
+        # Other test modules register components when they are imported, so only these are removed afterwards
+        for name, component_class in self.components.items():
+            component.registry.register(name=name, component=component_class)
+        AsyncComponent.started = []
+        SyncComponent.calls = 0
+
+    def tearDown(self):
+        for name in self.components:
+            component.registry.unregister(name)
+
+    def test_contexts_are_fetched_concurrently(self):
+        rendered = render('{% component "concurrent" "a" %}{% component "concurrent" "b" %}'
+                          '{% component "concurrent" "c" %}')
+
+        self.assertHTMLEqual(rendered, "Variable: <strong>a</strong>\nVariable: <strong>b</strong>\n"
+                                       "Variable: <strong>c</strong>\n")
+
+    def test_components_nested_in_async_component(self):
+        rendered = render('{% component_block "async_slotted" %}{% slot "header" %}'
+                          '{% component "async" variable=value %}{% endslot %}{% endcomponent_block %}',
+                          {"value": "nested"})
+
+        self.assertInHTML("<header>Variable: <strong>nested</strong></header>", rendered)
+
+    def test_sync_context_is_called_once(self):
+        rendered = render('{% component "sync" "one" %}{% component "async" "two" %}{% component "sync" "three" %}')
+
+        self.assertHTMLEqual(rendered, "Variable: <strong>one</strong>\nVariable: <strong>two</strong>\n"
+                                       "Variable: <strong>three</strong>\n")
+        self.assertEqual(SyncComponent.calls, 2)
+
+    def test_isolated_context(self):
+        rendered = render('{% component_block "async_slotted" only %}{% slot "header" %}'
+                          '{% component "async" "isolated" only %}{% endslot %}{% endcomponent_block %}')
+
+        self.assertInHTML("<header>Variable: <strong>isolated</strong></header>", rendered)
+
+    def test_component_map(self):
+        ConcurrentComponent.expected = 2
+        try:
+            rendered = render('{% component_map "concurrent" items as item item %}', {"items": ["a", "b"]})
+        finally:
+            ConcurrentComponent.expected = 3
+
+        self.assertHTMLEqual(rendered, "Variable: <strong>a</strong>\nVariable: <strong>b</strong>\n")
+
+    def test_sync_render_awaits_async_context(self):
+        template = Template('{% load component_tags %}{% component "async" "sync" %}')
+
+        self.assertHTMLEqual(template.render(Context({})), "Variable: <strong>sync</strong>\n")
+
+    def test_template_response_inserts_dependencies(self):
+        template = engines["django"].from_string(
+            '{% load component_tags %}{% component_js_dependencies %}{% component "async" "response" %}'
+        )
+        request = Mock()
+        response = AsyncTemplateResponse(request, template, {})
+        ComponentDependencyMiddleware(get_response=lambda _: None).process_template_response(request, response)
+        async_to_sync(response.render)()
+
+        self.assertHTMLEqual(response.content.decode(),
+                             '<script src="async.js"></script>Variable: <strong>response</strong>\n')
@@ -0,0 +1,132 @@
+import os
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import override_settings
+
+from .django_test_setup import *  # NOQA
+from django_components import component
+from django_components.bundles import bundle_files
+from django_components.middleware import render_media
+
+from .testutils import Django30CompatibleSimpleTestCase as SimpleTestCase, StaticFilesMixin
+
+STATIC_FILES = {
+    "header/header.css": b".header { background: url('img/logo.png?v=1'); }\n",
+    "header/header.js": b"var header = 1",
+    "footer/footer.css": b'.footer { background: url("data:image/png;base64,AA"); }\n',
+    "footer/footer.js": b"var footer = 2;",
+}
+
+
+class HeaderComponent(component.Component):
+    class Media:
+        css = {"all": ["https://cdn.example.com/lib.css", "header/header.css"]}
+        js = ["header/header.js"]
+
+
+class FooterComponent(component.Component):
+    class Media:
+        css = {"all": ["footer/footer.css", "missing.css"], "print": ["footer/footer.css"]}
+        js = ["footer/footer.js"]
+
+
+class BundleTest(StaticFilesMixin, SimpleTestCase):
+    static_files = STATIC_FILES
+    component_settings = {"bundle_dependencies": True}
+
+    def setUp(self):
+        super().setUp()
+        component.registry.register(name="bundle_header", component=HeaderComponent)
+        component.registry.register(name="bundle_footer", component=FooterComponent)
+
+    def tearDown(self):
+        component.registry.unregister("bundle_header")
+        component.registry.unregister("bundle_footer")
+
+    def read_bundle(self, url):
+        with open(os.path.join(self.static_root, url[len("/static/"):]), "rb") as f:
+            return f.read()
+
+    def bundle_urls(self, html, attribute):
+        return [part.split('"')[0] for part in html.split(attribute + '="/static/django_components/bundles/')[1:]]
+
+    def test_static_files_are_concatenated(self):
+        css, js = render_media([HeaderComponent, FooterComponent])
+
+        self.assertIn('<link href="https://cdn.example.com/lib.css"', css)
+        self.assertIn('<link href="/static/missing.css"', css)
+        self.assertNotIn("header.css", css)
+        self.assertEqual(len(self.bundle_urls(css, "href")), 1)
+        self.assertEqual(len(self.bundle_urls(js, "src")), 1)
+
+        js_url = "/static/django_components/bundles/" + self.bundle_urls(js, "src")[0]
+        self.assertEqual(self.read_bundle(js_url), b"var header = 1\n;\nvar footer = 2;")
+
+    def test_files_that_are_not_bundled_keep_their_place(self):
+        paths = ["header/header.js", "footer/footer.js", "https://cdn.example.com/lib.js", "missing.js",
+                 "footer/footer.js", "header/header.js"]
+        bundled = bundle_files(paths, "js", b"\n;\n")
+
+        self.assertEqual(len(bundled), 4)
+        self.assertEqual(bundled[1:3], ["https://cdn.example.com/lib.js", "missing.js"])
+        self.assertEqual(self.read_bundle(bundled[0]), b"var header = 1\n;\nvar footer = 2;")
+        self.assertEqual(self.read_bundle(bundled[3]), b"var footer = 2;\n;\nvar header = 1")
+
+    def test_relative_urls_in_stylesheets_are_made_absolute(self):
+        css, _ = render_media([HeaderComponent, FooterComponent])
+
+        bundle = self.read_bundle("/static/django_components/bundles/" + self.bundle_urls(css, "href")[0])
+        self.assertIn(b'url("/static/header/img/logo.png?v=1")', bundle)
+        self.assertIn(b'url("data:image/png;base64,AA")', bundle)
+
+    def test_single_static_file_is_not_bundled(self):
+        css, _ = render_media([FooterComponent])
+
+        self.assertIn('<link href="/static/footer/footer.css" type="text/css" media="print"', css)
+
+    def test_bundle_name_depends_on_content(self):
+        css, js = render_media([HeaderComponent, FooterComponent])
+        other_css, other_js = render_media([FooterComponent, HeaderComponent])
+
+        self.assertNotEqual(self.bundle_urls(js, "src"), self.bundle_urls(other_js, "src"))
+        with override_settings(COMPONENTS={"bundle_dependencies": True}):
+            self.assertEqual(render_media([HeaderComponent, FooterComponent]), (css, js))
+
+    @override_settings(DEBUG=True)
+    def test_changed_file_is_bundled_again(self):
+        _, js = render_media([HeaderComponent, FooterComponent])
+        self.write("footer/footer.js", b"var footer = 3;", mtime=1000000000)
+
+        _, changed_js = render_media([HeaderComponent, FooterComponent])
+        self.assertNotEqual(self.bundle_urls(changed_js, "src"), self.bundle_urls(js, "src"))
+        js_url = "/static/django_components/bundles/" + self.bundle_urls(changed_js, "src")[0]
+        self.assertEqual(self.read_bundle(js_url), b"var header = 1\n;\nvar footer = 3;")
+
+    def test_files_are_not_checked_for_changes_without_debug(self):
+        render_media([HeaderComponent, FooterComponent])
+        with patch("django_components.middleware.files_unchanged") as files_unchanged:
+            render_media([HeaderComponent, FooterComponent])
+        files_unchanged.assert_not_called()
+
+    def test_scripts_imported_as_modules_are_not_bundled(self):
+        with override_settings(IMPORT_SCRIPTS_AS_MODULES=True):
+            _, js = render_media([HeaderComponent, FooterComponent])
+
+        self.assertIn('src="/static/header/header.js"', js)
+        self.assertIn('src="/static/footer/footer.js"', js)
+
+    def test_bundling_is_off_by_default(self):
+        with override_settings(COMPONENTS={}):
+            css, js = render_media([HeaderComponent, FooterComponent])
+
+        self.assertIn('src="/static/header/header.js"', js)
+        self.assertIn('href="/static/header/header.css"', css)
+
+    def test_command_builds_bundles(self):
+        out = StringIO()
+        call_command("bundlecomponents", "bundle_header,bundle_footer", stdout=out)
+
+        self.assertIn("bundle_header, bundle_footer:", out.getvalue())
+        self.assertEqual(len(os.listdir(os.path.join(self.static_root, "django_components", "bundles"))), 2)
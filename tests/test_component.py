@@ -1,11 +1,13 @@
 from textwrap import dedent
 
 from django.template import Context
+from django.test import override_settings
 
 from .django_test_setup import *  # NOQA
 from .testutils import Django30CompatibleSimpleTestCase as SimpleTestCase
 
 from django_components import component
+from django_components.component import get_rendered_media
 
 
 class ComponentRegistryTest(SimpleTestCase):
@@ -97,3 +99,49 @@ class ComponentRegistryTest(SimpleTestCase):
                 <svg>Dynamic2</svg>
             """)
         )
+
+
+class RenderManyTest(SimpleTestCase):
+    def test_renders_each_context(self):
+        class SimpleComponent(component.Component):
+            def template(self, context):
+                return "simple_template.html"
+
+        comp = SimpleComponent("simple_component")
+        rendered = comp.render_many([{"variable": "one"}, {}, {"variable": "three"}])
+
+        self.assertEqual(rendered, [
+            "Variable: <strong>one</strong>\n",
+            "Variable: <strong></strong>\n",
+            "Variable: <strong>three</strong>\n",
+        ])
+
+
+class RenderedMediaTest(SimpleTestCase):
+    class StyledComponent(component.Component):
+        class Media:
+            css = {"all": ["style.css"]}
+            js = ["script.js"]
+
+    class UnstyledComponent(component.Component):
+        pass
+
+    def test_media_rendered_once_per_class(self):
+        first = get_rendered_media(self.StyledComponent)
+        self.StyledComponent("first").render_dependencies()
+        self.StyledComponent("second").render_dependencies()
+
+        self.assertIs(get_rendered_media(self.StyledComponent), first)
+
+    def test_has_media(self):
+        self.assertTrue(get_rendered_media(self.StyledComponent).has_media)
+        self.assertFalse(get_rendered_media(self.UnstyledComponent).has_media)
+
+    def test_rendered_media_updated_when_static_url_changes(self):
+        comp = self.StyledComponent("styled_component")
+        comp.render_css_dependencies()
+
+        with override_settings(STATIC_URL="/static/"):
+            self.assertHTMLEqual(comp.render_css_dependencies(),
+                                 '<link href="/static/style.css" type="text/css" media="all" rel="stylesheet">')
+            self.assertHTMLEqual(comp.render_js_dependencies(), '<script src="/static/script.js"></script>')
@@ -1,8 +1,12 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from django.template import Context, Template
 
 from .django_test_setup import *  # NOQA
 
 from django_components import component
+from django_components.component import OuterContext
 
 from .testutils import Django30CompatibleSimpleTestCase as SimpleTestCase
 
@@ -76,12 +80,43 @@ class OuterContextComponent(component.Component):
         return "simple_template.html"
 
 
+class OuterContextKeyComponent(component.Component):
+    def context(self):
+        return {"variable": self.outer_context.get("variable", "missing")}
+
+    def template(self, context):
+        return "simple_template.html"
+
+
+class NoOuterContextComponent(component.Component):
+    uses_outer_context = False
+
+    def context(self):
+        return {"variable": self.outer_context}
+
+    def template(self, context):
+        return "simple_template.html"
+
+
+class SlowOuterContextComponent(component.Component):
+    def context(self, value):
+        # Give other threads a chance to render the same node before outer_context is read
+        time.sleep(0.001)
+        return {"variable": "{}-{}".format(value, self.outer_context["variable"])}
+
+    def template(self, context):
+        return "simple_template.html"
+
+
 component.registry.register(name='parent_component', component=ParentComponent)
 component.registry.register(name='parent_with_args', component=ParentComponentWithArgs)
 component.registry.register(name='variable_display', component=VariableDisplay)
 component.registry.register(name='incrementer', component=IncrementerComponent)
 component.registry.register(name='simple_component', component=SimpleComponent)
 component.registry.register(name='outer_context_component', component=OuterContextComponent)
+component.registry.register(name='outer_context_key_component', component=OuterContextKeyComponent)
+component.registry.register(name='no_outer_context_component', component=NoOuterContextComponent)
+component.registry.register(name='slow_outer_context_component', component=SlowOuterContextComponent)
 
 
 class ContextTests(SimpleTestCase):
@@ -271,6 +306,31 @@ class IsolatedContextTests(SimpleTestCase):
         rendered = template.render(Context({'variable': 'outer_value'})).strip()
         self.assertNotIn('outer_value', rendered, rendered)
 
+    def test_isolated_component_keeps_context_settings(self):
+        template = Template("{% load component_tags %}{% component_dependencies %}"
+                            "{% component 'simple_component' variable only %}")
+        rendered = template.render(Context({'variable': '<b>'}, autoescape=False)).strip()
+        self.assertIn('<b>', rendered, rendered)
+
+    def test_outer_context_is_unchanged_after_isolated_component(self):
+        template = Template("{% load component_tags %}{% component_dependencies %}"
+                            "{% component 'simple_component' variable='inner_value' only %}"
+                            "{% cycle 'first' 'second' %} {{ variable }}")
+        context = Context({'variable': 'outer_value'})
+        rendered = template.render(context).strip()
+        self.assertTrue(rendered.endswith('first outer_value'), rendered)
+        self.assertEqual(len(context.dicts), 2)
+        self.assertEqual(len(context.render_context.dicts), 1)
+
+    def test_nested_isolated_components(self):
+        template = Template("{% load component_tags %}{% component_dependencies %}"
+                            "{% component_block 'parent_component' only %}{% slot 'content' %}"
+                            "{% component 'variable_display' shadowing_variable='inner' only %}"
+                            "{% endslot %}{% endcomponent_block %}")
+        rendered = template.render(Context({'shadowing_variable': 'outer'}))
+        self.assertIn('<h1>Shadowing variable = inner</h1>', rendered, rendered)
+        self.assertNotIn('outer', rendered, rendered)
+
 
 class OuterContextPropertyTests(SimpleTestCase):
     def test_outer_context_property_with_component(self):
@@ -284,3 +344,63 @@ class OuterContextPropertyTests(SimpleTestCase):
                             "{% component_block 'outer_context_component' only %}{% endcomponent_block %}")
         rendered = template.render(Context({'variable': 'outer_value'})).strip()
         self.assertIn('outer_value', rendered, rendered)
+
+    def test_outer_context_lookup_of_single_key(self):
+        template = Template("{% load component_tags %}{% component_dependencies %}"
+                            "{% with variable='inner_value' %}{% component 'outer_context_key_component' %}"
+                            "{% endwith %}")
+        rendered = template.render(Context({'variable': 'outer_value'})).strip()
+        self.assertIn('inner_value', rendered, rendered)
+
+    def test_outer_context_missing_key(self):
+        template = Template("{% load component_tags %}{% component_dependencies %}"
+                            "{% component 'outer_context_key_component' %}")
+        rendered = template.render(Context({})).strip()
+        self.assertIn('missing', rendered, rendered)
+
+    def test_outer_context_not_captured_when_not_used(self):
+        template = Template("{% load component_tags %}{% component_dependencies %}"
+                            "{% component 'no_outer_context_component' %}")
+        rendered = template.render(Context({'variable': 'outer_value'})).strip()
+        self.assertIn('None', rendered, rendered)
+
+
+class OuterContextViewTests(SimpleTestCase):
+    def test_view_matches_flattened_context(self):
+        context = Context({'a': 1, 'b': 2})
+        context.update({'b': 3})
+        outer_context = OuterContext(context)
+
+        self.assertEqual(outer_context['b'], 3)
+        self.assertEqual(dict(outer_context), context.flatten())
+
+    def test_view_is_not_affected_by_later_pushes(self):
+        context = Context({'a': 1})
+        outer_context = OuterContext(context)
+        context.update({'a': 2})
+
+        self.assertEqual(outer_context['a'], 1)
+        self.assertNotIn('b', outer_context)
+
+    def test_view_is_read_only(self):
+        outer_context = OuterContext(Context({'a': 1}))
+
+        with self.assertRaises(TypeError):
+            outer_context['a'] = 2
+
+
+class ThreadSafetyTests(SimpleTestCase):
+    def test_concurrent_renders_of_one_template_are_deterministic(self):
+        template = Template("{% load component_tags %}"
+                            "{% component_block 'slow_outer_context_component' value=value %}{% endcomponent_block %}"
+                            "{% component 'slow_outer_context_component' value=value only %}")
+
+        def render(i):
+            return template.render(Context({'value': i, 'variable': i * 2}))
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(render, range(200)))
+
+        for i, rendered in enumerate(results):
+            expected = 'Variable: <strong>{}-{}</strong>\n'.format(i, i * 2)
+            self.assertEqual(rendered, expected * 2)
@@ -1,7 +1,16 @@
-from django.template import Template
+from unittest.mock import Mock
+
+from django.http import StreamingHttpResponse
+from django.template import Context, Template
 
 from .django_test_setup import *  # NOQA
 from django_components import component
+from django_components.context_processors import component_dependencies
+from django_components.middleware import (
+    CSS_DEPENDENCY_PLACEHOLDER, JS_DEPENDENCY_PLACEHOLDER, RENDERED_COMPONENTS_CONTEXT_KEY, ComponentDependencies,
+    ComponentDependencyMiddleware, DependencyReplacer, insert_dependencies, join_media, render_media,
+    rendered_media_cache, split_placeholders,
+)
 
 from .test_templatetags import SimpleComponent
 from .testutils import create_and_process_template_response, Django30CompatibleSimpleTestCase as SimpleTestCase
@@ -216,3 +225,147 @@ class ComponentMediaRenderingTests(SimpleTestCase):
         self.assert_script_count(rendered, 'script.js', 1)
         self.assert_stylesheet_count(rendered, 'style2.css', 1)
         self.assert_stylesheet_count(rendered, 'style.css', 1)
+
+
+class MediaAggregationTests(SimpleTestCase):
+    def setUp(self):
+        rendered_media_cache.clear()
+
+    def test_join_media_deduplicates_by_class(self):
+        single = join_media([SimpleComponent("test"), SimpleComponentAlternate("test2")])
+        repeated = join_media([SimpleComponent("test") for _ in range(100)] + [SimpleComponentAlternate("test2")])
+
+        self.assertEqual(len(repeated._js_lists), len(single._js_lists))
+        self.assertEqual(repeated._js, ["script.js", "script2.js"])
+
+    def test_join_media_merges_shared_dependencies(self):
+        media = join_media([SimpleComponent("test"), SimpleComponentWithSharedDependency("test3")])
+
+        self.assertEqual(media._js, ["script.js", "script2.js"])
+        self.assertEqual(media._css, {"all": ["style.css", "style2.css"]})
+
+    def test_rendered_media_memoized_by_component_classes(self):
+        first = render_media([SimpleComponent, SimpleComponentAlternate])
+        second = render_media([SimpleComponent, SimpleComponentAlternate, SimpleComponent])
+
+        self.assertEqual(first, second)
+        self.assertEqual(rendered_media_cache.info().hits, 1)
+        self.assertEqual(len(rendered_media_cache), 1)
+
+    def test_rendered_media_follows_first_render_order(self):
+        css, js = render_media([SimpleComponentAlternate, SimpleComponent])
+
+        self.assertLess(css.index("style2.css"), css.index("style.css"))
+        self.assertLess(js.index("script2.js"), js.index("script.js"))
+
+    def test_dependencies_track_component_classes_in_render_order(self):
+        component.registry.clear()
+        component.registry.register(name="test1", component=SimpleComponent)
+        component.registry.register(name="test2", component=SimpleComponentAlternate)
+        dependencies = ComponentDependencies()
+
+        template = Template("{% load component_tags %}"
+                            "{% component 'test2' variable='a' %}{% component 'test1' variable='b' %}"
+                            "{% component 'test2' variable='c' %}")
+        template.render(Context({RENDERED_COMPONENTS_CONTEXT_KEY: dependencies}))
+
+        self.assertEqual(list(dependencies), [SimpleComponentAlternate, SimpleComponent])
+
+
+class InsertDependenciesTests(SimpleTestCase):
+    css_placeholder = CSS_DEPENDENCY_PLACEHOLDER.encode()
+    js_placeholder = JS_DEPENDENCY_PLACEHOLDER.encode()
+
+    def insert(self, content):
+        replacer = DependencyReplacer("<css>", "<js>", use_modules=False)
+        return insert_dependencies(content, replacer)
+
+    def test_placeholders_are_replaced(self):
+        content = b"<head>" + self.css_placeholder + b"</head><body>" + self.js_placeholder + b"</body>"
+
+        self.assertEqual(self.insert(content), b"<head><css></head><body><js></body>")
+
+    def test_only_first_placeholder_of_each_kind_is_replaced(self):
+        content = (self.css_placeholder + self.js_placeholder + b"<p>"
+                   + self.css_placeholder + self.js_placeholder + b"</p>")
+
+        self.assertEqual(self.insert(content), b"<css><js><p></p>")
+
+    def test_placeholders_are_replaced_in_the_order_they_appear(self):
+        content = (self.js_placeholder + b"<p>" + self.css_placeholder + self.js_placeholder + b"</p>"
+                   + self.css_placeholder)
+
+        self.assertEqual(self.insert(content), b"<js><p><css></p>")
+
+    def test_placeholders_rendered_outside_of_the_response_context_are_removed(self):
+        component.registry.clear()
+        component.registry.register(name="test", component=SimpleComponent)
+        # Rendered on its own, so its placeholders aren't seen by the dependency tags of the page
+        snippet = Template("{% load component_tags %}<p>{% component_dependencies %}</p>").render(Context({}))
+        template = Template("{% load component_tags %}{% component_dependencies %}"
+                            "{% component 'test' variable='page' %}{{ snippet }}")
+        content = create_and_process_template_response(template, Context({"snippet": snippet})).content
+
+        self.assertNotIn(self.css_placeholder, content)
+        self.assertNotIn(self.js_placeholder, content)
+        self.assertTrue(content.startswith(b'<link href="style.css"'), content)
+        self.assertTrue(content.endswith(b"<p></p>"), content)
+
+    def test_content_without_placeholders_is_returned_unchanged(self):
+        content = b"<p>No dependencies</p>"
+
+        self.assertIs(self.insert(content), content)
+
+
+class StreamingDependencyTests(SimpleTestCase):
+    def setUp(self):
+        component.registry.clear()
+        component.registry.register(name="test", component=SimpleComponent)
+
+    def stream_response(self, chunks):
+        """Run a streamed response through the middleware, rendering each chunk with the request's context."""
+
+        def get_response(request):
+            def render_chunks():
+                for chunk in chunks:
+                    context = Context(component_dependencies(request))
+                    yield Template("{% load component_tags %}" + chunk).render(context)
+
+            return StreamingHttpResponse(render_chunks())
+
+        return ComponentDependencyMiddleware(get_response)(Mock())
+
+    def test_split_placeholders_reassembles_placeholders_across_chunks(self):
+        css_placeholder, js_placeholder = CSS_DEPENDENCY_PLACEHOLDER.encode(), JS_DEPENDENCY_PLACEHOLDER.encode()
+        chunks = [b"<head>" + css_placeholder[:5], css_placeholder[5:] + b"<", b"/head>" + js_placeholder]
+        parts = list(split_placeholders(chunks))
+
+        self.assertEqual(b"".join(data for _, data in parts),
+                         b"<head>" + css_placeholder + b"</head>" + js_placeholder)
+        self.assertEqual([data for is_placeholder, data in parts if is_placeholder], [css_placeholder, js_placeholder])
+
+    def test_dependencies_inserted_into_streamed_response(self):
+        response = self.stream_response(["<head>{% component_css_dependencies %}</head>",
+                                         "<body>{% component 'test' variable='foo' %}",
+                                         "{% component_js_dependencies %}</body>"])
+        rendered = b"".join(response.streaming_content).decode('utf-8')
+
+        self.assertEqual(rendered.count('href="style.css"'), 1)
+        self.assertEqual(rendered.count('src="script.js"'), 1)
+        self.assertNotIn(CSS_DEPENDENCY_PLACEHOLDER, rendered)
+        self.assertNotIn(JS_DEPENDENCY_PLACEHOLDER, rendered)
+
+    def test_content_before_first_placeholder_is_not_buffered(self):
+        response = self.stream_response(["<html><head>", "<title>Page</title>",
+                                         "{% component_css_dependencies %}</head>",
+                                         "{% component 'test' variable='foo' %}"])
+        content = iter(response.streaming_content)
+
+        self.assertEqual(next(content), b"<html><head>")
+        self.assertEqual(next(content), b"<title>Page</title>")
+
+    def test_streamed_response_without_placeholders_is_unchanged(self):
+        response = self.stream_response(["<p>", "{% component 'test' variable='foo' %}", "</p>"])
+
+        self.assertEqual(list(response.streaming_content),
+                         [b"<p>", b"Variable: <strong>foo</strong>\n", b"</p>"])
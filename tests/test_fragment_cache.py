@@ -0,0 +1,195 @@
+import pickle
+from unittest.mock import patch
+
+from django.template import Context, Template
+from django.test import override_settings
+
+from .django_test_setup import *  # NOQA
+from django_components import component
+from django_components.fragment_cache import (
+    DjangoFragmentCache, Fragment, LocalFragmentCache, get_fragment_cache, key_part, make_fragment_key,
+)
+from django_components.middleware import RENDERED_COMPONENTS_CONTEXT_KEY, ComponentDependencies
+
+from .testutils import Django30CompatibleSimpleTestCase as SimpleTestCase
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+class CountingComponent(component.Component):
+    cache_timeout = 60
+    context_calls = 0
+
+    def context(self, variable):
+        CountingComponent.context_calls += 1
+        return {"variable": variable}
+
+    def template(self, context):
+        return "simple_template.html"
+
+    class Media:
+        css = {"all": ["style.css"]}
+        js = ["script.js"]
+
+
+class VaryOnComponent(CountingComponent):
+    cache_vary_on = ("user.name",)
+
+    def context(self):
+        CountingComponent.context_calls += 1
+        return {"variable": self.outer_context["user"]["name"]}
+
+
+class KeyedComponent(CountingComponent):
+    def get_cache_key(self, variable):
+        return variable["id"]
+
+
+class CachedSlottedComponent(component.Component):
+    cache_timeout = 60
+
+    def template(self, context):
+        return "slotted_template.html"
+
+
+class CachedParentComponent(component.Component):
+    cache_timeout = 60
+
+    def template(self, context):
+        return "cached_parent_template.html"
+
+
+class ChildComponent(component.Component):
+    def template(self, context):
+        return "simple_template.html"
+
+    class Media:
+        js = ["child.js"]
+
+
+class FragmentCacheTest(SimpleTestCase):
+    def setUp(self):
+        component.registry.clear()
+        component.registry.register(name="counting", component=CountingComponent)
+        component.registry.register(name="vary_on", component=VaryOnComponent)
+        component.registry.register(name="keyed", component=KeyedComponent)
+        component.registry.register(name="slotted", component=CachedSlottedComponent)
+        component.registry.register(name="parent", component=CachedParentComponent)
+        component.registry.register(name="child", component=ChildComponent)
+        get_fragment_cache().clear()
+        CountingComponent.context_calls = 0
+
+    def render(self, source, context=None):
+        return Template("{% load component_tags %}" + source).render(Context(context or {}))
+
+    def test_cache_hit_skips_context(self):
+        template = Template('{% load component_tags %}{% component "counting" variable=value %}')
+        first = template.render(Context({"value": "one"}))
+        second = template.render(Context({"value": "one"}))
+
+        self.assertEqual(first, second)
+        self.assertEqual(CountingComponent.context_calls, 1)
+
+    def test_different_arguments_are_cached_separately(self):
+        template = Template('{% load component_tags %}{% component "counting" variable=value %}')
+
+        self.assertIn("one", template.render(Context({"value": "one"})))
+        self.assertIn("two", template.render(Context({"value": "two"})))
+        self.assertEqual(CountingComponent.context_calls, 2)
+
+    def test_usages_with_same_arguments_share_fragment(self):
+        self.render('{% component "counting" variable="one" %}{% component "counting" variable="one" %}')
+
+        self.assertEqual(CountingComponent.context_calls, 1)
+
+    def test_cache_varies_on_context_variables(self):
+        template = Template('{% load component_tags %}{% component "vary_on" %}')
+
+        self.assertIn("Ann", template.render(Context({"user": {"name": "Ann"}})))
+        self.assertIn("Bob", template.render(Context({"user": {"name": "Bob"}})))
+        self.assertIn("Ann", template.render(Context({"user": {"name": "Ann"}})))
+        self.assertEqual(CountingComponent.context_calls, 2)
+
+    def test_get_cache_key_selects_arguments(self):
+        template = Template('{% load component_tags %}{% component "keyed" variable=item %}')
+        template.render(Context({"item": {"id": 1, "name": "First"}}))
+        rendered = template.render(Context({"item": {"id": 1, "name": "Renamed"}}))
+
+        self.assertIn("First", rendered)
+        self.assertEqual(CountingComponent.context_calls, 1)
+
+    def test_filled_slots_are_part_of_key(self):
+        rendered = self.render(
+            '{% component_block "slotted" %}{% slot "header" %}One{% endslot %}{% endcomponent_block %}'
+            '{% component_block "slotted" %}{% slot "header" %}Two{% endslot %}{% endcomponent_block %}'
+        )
+
+        self.assertIn("<header>One</header>", rendered)
+        self.assertIn("<header>Two</header>", rendered)
+
+    def test_slots_with_variables_are_not_cached(self):
+        template = Template(
+            '{% load component_tags %}'
+            '{% component_block "slotted" %}{% slot "header" %}{{ user }}{% endslot %}{% endcomponent_block %}'
+        )
+
+        self.assertIn("<header>alice</header>", template.render(Context({"user": "alice"})))
+        self.assertIn("<header>bob</header>", template.render(Context({"user": "bob"})))
+
+    def test_expired_fragment_is_rendered_again(self):
+        template = Template('{% load component_tags %}{% component "counting" variable="one" %}')
+        with patch("django_components.fragment_cache.monotonic", return_value=0):
+            template.render(Context({}))
+        with patch("django_components.fragment_cache.monotonic", return_value=61):
+            template.render(Context({}))
+
+        self.assertEqual(CountingComponent.context_calls, 2)
+
+    def test_cache_hit_registers_media_of_nested_components(self):
+        template = Template('{% load component_tags %}{% component "parent" %}')
+        template.render(Context({RENDERED_COMPONENTS_CONTEXT_KEY: ComponentDependencies()}))
+
+        rendered_components = ComponentDependencies()
+        template.render(Context({RENDERED_COMPONENTS_CONTEXT_KEY: rendered_components}))
+
+        self.assertEqual(list(rendered_components), [CachedParentComponent, ChildComponent])
+
+    def test_unidentifiable_argument_raises(self):
+        with self.assertRaises(TypeError):
+            self.render('{% component "counting" variable=value %}', {"value": object()})
+
+    @override_settings(CACHES=LOCMEM_CACHES, COMPONENTS={"fragment_cache": "default"})
+    def test_django_cache_backend(self):
+        self.assertIsInstance(get_fragment_cache(), DjangoFragmentCache)
+
+        template = Template('{% load component_tags %}{% component "counting" variable="one" %}')
+        template.render(Context({}))
+        template.render(Context({}))
+
+        self.assertEqual(CountingComponent.context_calls, 1)
+
+    @override_settings(COMPONENTS={"fragment_cache_size": 1})
+    def test_local_cache_size(self):
+        self.assertIsInstance(get_fragment_cache(), LocalFragmentCache)
+
+        self.render('{% component "counting" variable="one" %}{% component "counting" variable="two" %}')
+
+        self.assertEqual(get_fragment_cache().info().currsize, 1)
+
+
+class FragmentKeyTest(SimpleTestCase):
+    def test_key_is_independent_of_dict_order(self):
+        self.assertEqual(key_part({"a": 1, "b": 2}), key_part({"b": 2, "a": 1}))
+
+    def test_key_names_component(self):
+        key = make_fragment_key(CountingComponent, (), {})
+
+        self.assertTrue(key.startswith("django_components.fragment.tests.test_fragment_cache.CountingComponent."))
+
+    def test_fragment_can_be_pickled(self):
+        rendered_components = ComponentDependencies()
+        rendered_components.add(ChildComponent)
+        fragment = pickle.loads(pickle.dumps(Fragment("<p>Hi</p>", rendered_components)))
+
+        self.assertEqual(fragment.render(), "<p>Hi</p>")
+        self.assertEqual(fragment.component_classes, (ChildComponent,))
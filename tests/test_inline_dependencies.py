@@ -0,0 +1,100 @@
+from unittest.mock import patch
+
+from django.forms.widgets import Media
+from django.template import Template
+
+from .django_test_setup import *  # NOQA
+from django_components import component
+from django_components.inline_dependencies import get_static_file, static_file_cache
+from django_components.middleware import render_media
+
+from .testutils import (
+    create_and_process_template_response, Django30CompatibleSimpleTestCase as SimpleTestCase, StaticFilesMixin,
+)
+
+STATIC_FILES = {
+    "small/small.css": b".small { background: url(icon.png); }",
+    "small/small.js": b"var small = 1;",
+    "large.css": b".large {}" + b" " * 200,
+    "wide.css": b".wide {}" + b" " * 200,
+    "ending.js": b"document.write('</SCRIPT>');",
+}
+
+
+class SmallComponent(component.Component):
+    def template(self, context):
+        return "slotted_template_no_slots.html"
+
+    class Media:
+        css = {"all": ["large.css", "small/small.css"]}
+        js = ["small/small.js", "ending.js"]
+
+
+class WideComponent(component.Component):
+    class Media:
+        css = {"all": ["wide.css"]}
+
+
+class InlineDependenciesTest(StaticFilesMixin, SimpleTestCase):
+    static_files = STATIC_FILES
+    component_settings = {"inline_dependencies_max_size": 100}
+
+    def setUp(self):
+        super().setUp()
+        static_file_cache.clear()
+        component.registry.register(name="small", component=SmallComponent)
+
+    def tearDown(self):
+        component.registry.unregister("small")
+
+    def test_small_files_are_inlined_in_place(self):
+        css, js = render_media([SmallComponent])
+
+        self.assertHTMLEqual(css, '<link href="/static/large.css" type="text/css" media="all" rel="stylesheet">'
+                                  '<style media="all">.small { background: url("/static/small/icon.png"); }</style>')
+        self.assertHTMLEqual(js, '<script>var small = 1;</script><script src="/static/ending.js"></script>')
+
+    def test_inlining_is_off_by_default(self):
+        self.use_settings(COMPONENTS={})
+        css, js = render_media([SmallComponent])
+
+        self.assertNotIn("<style", css)
+        self.assertIn('src="/static/small/small.js"', js)
+
+    def test_files_are_read_once(self):
+        first = get_static_file("small/small.js")
+        with patch("django_components.inline_dependencies.finders.find") as find:
+            self.assertIs(get_static_file("small/small.js"), first)
+        find.assert_not_called()
+
+    def test_large_files_are_not_read(self):
+        with patch("django_components.inline_dependencies.open") as open_file:
+            self.assertIsNone(get_static_file("large.css", max_size=100))
+        open_file.assert_not_called()
+        self.assertNotIn("large.css", static_file_cache)
+
+    def test_changed_file_is_inlined_again(self):
+        self.use_settings(DEBUG=True, COMPONENTS={"inline_dependencies_max_size": 100})
+        render_media([SmallComponent])
+        self.write("small/small.js", b"var small = 2;", mtime=1000000000)
+
+        _, js = render_media([SmallComponent])
+        self.assertIn("<script>var small = 2;</script>", js)
+
+    def test_inlined_files_keep_their_place_among_bundles(self):
+        self.use_settings(COMPONENTS={"inline_dependencies_max_size": 100, "bundle_dependencies": True})
+        css, js = render_media([WideComponent, SmallComponent])
+
+        self.assertRegex(css, r'^<link href="/static/django_components/bundles/\w+\.css"[^>]*>'
+                              r'<style media="all">\.small[^<]*</style>$')
+        self.assertHTMLEqual(js, '<script>var small = 1;</script><script src="/static/ending.js"></script>')
+
+    def test_placeholders_are_replaced_with_inlined_files(self):
+        template = Template("{% load component_tags %}<head>{% component_css_dependencies %}</head>"
+                            "{% component 'small' %}{% component_js_dependencies %}")
+        rendered = create_and_process_template_response(template).content.decode("utf-8")
+
+        self.assertIn('<head><link href="/static/large.css"', rendered)
+        self.assertIn('<style media="all">.small', rendered)
+        ending_script = Media(js=["ending.js"]).render_js()[0]
+        self.assertTrue(rendered.endswith("<script>var small = 1;</script>" + ending_script), rendered)
@@ -0,0 +1,85 @@
+from django.template import Context, Template
+from django.template.loader import get_template
+from django.test import override_settings
+
+from .django_test_setup import *  # NOQA
+from django_components import component
+from django_components.minify import WhitespaceCollapser
+
+from .testutils import Django30CompatibleSimpleTestCase as SimpleTestCase
+
+
+class MinifiedComponent(component.Component):
+    def context(self, title):
+        return {"title": title, "show": True}
+
+    def template(self, context):
+        return "minify_template.html"
+
+
+def render(source):
+    return Template("{% load component_tags %}" + source).render(Context({}))
+
+
+class MinifyTemplatesTest(SimpleTestCase):
+    def setUp(self):
+        component.registry.register(name="minified", component=MinifiedComponent)
+
+    def tearDown(self):
+        component.registry.unregister("minified")
+
+    def test_whitespace_is_kept_by_default(self):
+        rendered = render('{% component "minified" title="Title" %}')
+
+        self.assertIn('\n    <h2>  Title  </h2>\n', rendered)
+
+    def test_whitespace_is_collapsed(self):
+        with override_settings(COMPONENTS={"minify_templates": True}):
+            rendered = render('{% component "minified" title="Title" %}')
+
+        self.assertIn('\n<div class="card">\n<h2> Title </h2>\n\n<p>\nShown\n</p>\n', rendered)
+        self.assertIn("\n<p>Default body</p>\n", rendered)
+
+    def test_raw_text_elements_are_kept(self):
+        with override_settings(COMPONENTS={"minify_templates": True}):
+            rendered = render('{% component "minified" title="Title" %}')
+
+        self.assertIn("<pre>\n  keep   Title\n    </pre>\n", rendered)
+        self.assertIn("<script>\n        var x  =  1;\n    </script>\n", rendered)
+        self.assertIn("<textarea>  Title\n  too  </textarea>\n", rendered)
+
+    def test_filled_slots_are_not_minified(self):
+        with override_settings(COMPONENTS={"minify_templates": True}):
+            rendered = render('{% component_block "minified" title="Title" %}{% slot "body" %}  Filled  body'
+                              '{% endslot %}{% endcomponent_block %}')
+
+        self.assertIn("  Filled  body", rendered)
+
+    def test_loaded_template_is_not_changed(self):
+        with override_settings(COMPONENTS={"minify_templates": True}):
+            render('{% component "minified" title="Title" %}')
+
+        source = get_template("minify_template.html").template.nodelist.render(Context({"title": "Title"}))
+        self.assertIn('\n    <h2>  Title  </h2>\n', source)
+
+
+class WhitespaceCollapserTest(SimpleTestCase):
+    def test_collapses_runs_of_whitespace(self):
+        self.assertEqual(WhitespaceCollapser().collapse("<p>\n    a  \t b\n</p>  "), "<p>\na b\n</p> ")
+
+    def test_raw_text_element_can_span_text_nodes(self):
+        collapser = WhitespaceCollapser()
+
+        self.assertEqual(collapser.collapse("<div>  <PRE class='code'>  a"), "<div> <PRE class='code'>  a")
+        self.assertEqual(collapser.collapse("  b  </pre>  c"), "  b  </pre> c")
+
+    def test_quoted_attribute_values_are_kept(self):
+        collapser = WhitespaceCollapser()
+
+        self.assertEqual(collapser.collapse('<a  title="a    b"  data-x = \'c  d\'>  e  </a>'),
+                         '<a title="a    b" data-x = \'c  d\'> e </a>')
+        self.assertEqual(collapser.collapse('<img alt="x  '), '<img alt="x  ')
+        self.assertEqual(collapser.collapse('  y"  >'), '  y" >')
+
+    def test_tags_that_start_like_raw_text_elements(self):
+        self.assertEqual(WhitespaceCollapser().collapse("<preview>  a  </preview>"), "<preview> a </preview>")
@@ -0,0 +1,184 @@
+import asyncio
+import json
+import time
+from unittest import skipUnless
+from unittest.mock import Mock
+
+from django.http import HttpResponse
+from django.template import Context, Template, engines
+
+from .django_test_setup import *  # NOQA
+from django_components import component
+from django_components.async_rendering import render_async
+from django_components.fragment_cache import get_fragment_cache
+from django_components.profiling import ComponentProfilerMiddleware, profile_components
+from django_components.signals import component_post_render, is_enabled
+
+from .testutils import Django30CompatibleSimpleTestCase as SimpleTestCase
+
+try:
+    from asgiref.sync import async_to_sync
+except ImportError:
+    # asgiref is only installed with Django 3.0 and later
+    async_to_sync = None
+
+
+class ProfiledComponent(component.Component):
+    def context(self, variable):
+        return {"variable": variable}
+
+    def template(self, context):
+        return "simple_template.html"
+
+
+class ProfiledSlottedComponent(component.Component):
+    def template(self, context):
+        return "slotted_template.html"
+
+
+class ProfiledCachedComponent(ProfiledComponent):
+    cache_timeout = 60
+
+
+class ProfiledAsyncComponent(component.Component):
+    async def context(self, variable):
+        return {"variable": variable}
+
+    def template(self, context):
+        return "simple_template.html"
+
+
+class ProfiledSlowComponent(ProfiledComponent):
+    def context(self, variable):
+        time.sleep(0.05)
+        return {"variable": variable}
+
+
+class ProfiledSlowAsyncComponent(ProfiledAsyncComponent):
+    async def context(self, variable):
+        await asyncio.sleep(0.05)
+        return {"variable": variable}
+
+
+def render(source, context=None):
+    return Template("{% load component_tags %}" + source).render(Context(context or {}))
+
+
+class ProfilingTest(SimpleTestCase):
+    components = {
+        "profiled": ProfiledComponent,
+        "profiled_slotted": ProfiledSlottedComponent,
+        "profiled_cached": ProfiledCachedComponent,
+        "profiled_async": ProfiledAsyncComponent,
+        "profiled_slow": ProfiledSlowComponent,
+        "profiled_slow_async": ProfiledSlowAsyncComponent,
+    }
+
+    def setUp(self):
+        for name, component_class in self.components.items():
+            component.registry.register(name=name, component=component_class)
+        get_fragment_cache().clear()
+
+    def tearDown(self):
+        for name in self.components:
+            component.registry.unregister(name)
+
+    def test_signals_have_no_receivers_outside_profile(self):
+        self.assertFalse(is_enabled())
+        with profile_components():
+            self.assertTrue(is_enabled())
+        self.assertFalse(is_enabled())
+
+    def test_post_render_signal(self):
+        receiver = Mock()
+        component_post_render.connect(receiver)
+        try:
+            rendered = render('{% component "profiled" variable="one" %}')
+        finally:
+            component_post_render.disconnect(receiver)
+
+        kwargs = receiver.call_args[1]
+        self.assertEqual(kwargs["sender"], ProfiledComponent)
+        self.assertEqual(kwargs["name"], "profiled")
+        self.assertEqual(kwargs["size"], len(rendered))
+        self.assertIsNone(kwargs["cache_hit"])
+        self.assertFalse(kwargs["pending"])
+        self.assertGreaterEqual(kwargs["context_time"], 0)
+        self.assertGreaterEqual(kwargs["render_time"], 0)
+
+    def test_nested_components_form_tree(self):
+        with profile_components() as profile:
+            render('{% component_block "profiled_slotted" %}{% slot "header" %}'
+                   '{% component "profiled" variable="one" %}{% component "profiled" variable="two" %}'
+                   '{% endslot %}{% endcomponent_block %}')
+
+        tree = json.loads(profile.to_json())
+        self.assertEqual(len(tree), 1)
+        self.assertEqual(tree[0]["name"], "profiled_slotted")
+        self.assertEqual([child["name"] for child in tree[0]["children"]], ["profiled", "profiled"])
+        self.assertEqual({name: count for name, count, _ in profile.totals()}, {"profiled_slotted": 1, "profiled": 2})
+
+    def test_cache_hits_are_recorded(self):
+        with profile_components() as profile:
+            render('{% component "profiled_cached" variable="one" %}{% component "profiled_cached" variable="one" %}')
+
+        self.assertEqual([entry.cache_hit for entry in profile.roots], [False, True])
+
+    def test_component_map_records_each_item(self):
+        with profile_components() as profile:
+            rendered = render('{% component_map "profiled" items as item variable=item %}', {"items": ["a", "b"]})
+
+        self.assertHTMLEqual(rendered, "Variable: <strong>a</strong>\nVariable: <strong>b</strong>\n")
+        self.assertEqual([entry.name for entry in profile.roots], ["profiled", "profiled"])
+
+    @skipUnless(async_to_sync, "asgiref is only installed with Django 3.0 and later")
+    def test_async_render_records_complete_renders_only(self):
+        template = engines["django"].from_string(
+            '{% load component_tags %}{% component_block "profiled_slotted" %}{% slot "header" %}'
+            '{% component "profiled_async" variable="one" %}{% endslot %}{% endcomponent_block %}'
+        )
+        with profile_components() as profile:
+            async_to_sync(render_async)(template)
+
+        self.assertEqual(len(profile.roots), 1)
+        self.assertEqual([child.name for child in profile.roots[0].children], ["profiled_async"])
+
+    @skipUnless(async_to_sync, "asgiref is only installed with Django 3.0 and later")
+    def test_async_render_does_not_subtract_context_time_spent_outside_render(self):
+        template = engines["django"].from_string(
+            '{% load component_tags %}{% component "profiled_slow" variable="sync" %}'
+            '{% component "profiled_slow_async" variable="async" %}'
+        )
+        receiver = Mock()
+        component_post_render.connect(receiver)
+        try:
+            async_to_sync(render_async)(template)
+        finally:
+            component_post_render.disconnect(receiver)
+
+        calls = [call[1] for call in receiver.call_args_list]
+        for kwargs in calls:
+            self.assertGreaterEqual(kwargs["render_time"], 0)
+        # The sync component is rendered in both passes, and the async one again once its context has been fetched
+        complete = [kwargs for kwargs in calls if not kwargs["pending"]]
+        self.assertEqual([kwargs["name"] for kwargs in complete],
+                         ["profiled_slow", "profiled_slow", "profiled_slow_async"])
+        for kwargs in complete:
+            self.assertGreaterEqual(kwargs["context_time"], 0.05)
+
+    def test_component_render(self):
+        with profile_components() as profile:
+            ProfiledComponent("profiled").render(Context({"variable": "one"}))
+
+        self.assertEqual([entry.name for entry in profile.roots], ["profiled"])
+
+    def test_middleware_adds_server_timing_header(self):
+        def view(request):
+            return HttpResponse(render('{% component "profiled" variable="one" %}'))
+
+        request = Mock()
+        response = ComponentProfilerMiddleware(view)(request)
+
+        self.assertRegex(response["Server-Timing"], r'^profiled;dur=\d+\.\d{3};desc="profiled x1"$')
+        self.assertEqual(len(request.component_profile.roots), 1)
+        self.assertFalse(is_enabled())
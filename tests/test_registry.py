@@ -1,7 +1,15 @@
+import json
+import sys
+import tempfile
 import unittest
 
+from django.test import override_settings
+
 from .django_test_setup import *  # NOQA
-from django_components import component
+from django_components import autodiscover, component
+
+LAZY_COMPONENT_MODULE = "tests.lazy_components"
+LAZY_COMPONENT_PATH = LAZY_COMPONENT_MODULE + ".LazyComponent"
 
 
 class MockComponent(object):
@@ -43,3 +51,77 @@ class ComponentRegistryTest(unittest.TestCase):
     def test_raises_on_failed_unregister(self):
         with self.assertRaises(component.NotRegistered):
             self.registry.unregister(name="testcomponent")
+
+
+class LazyComponentRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = component.ComponentRegistry()
+        sys.modules.pop(LAZY_COMPONENT_MODULE, None)
+
+    def test_component_imported_when_first_used(self):
+        self.registry.register(name="lazy", component=LAZY_COMPONENT_PATH)
+
+        self.assertNotIn(LAZY_COMPONENT_MODULE, sys.modules)
+        self.assertFalse(self.registry.is_loaded("lazy"))
+
+        component_class = self.registry.get("lazy")
+
+        self.assertEqual(component_class.__name__, "LazyComponent")
+        self.assertTrue(self.registry.is_loaded("lazy"))
+        self.assertIs(self.registry.get("lazy"), component_class)
+
+    def test_all_imports_lazy_components(self):
+        self.registry.register(name="lazy", component=LAZY_COMPONENT_PATH)
+
+        self.assertEqual(self.registry.all()["lazy"].__name__, "LazyComponent")
+
+    def test_module_can_register_lazy_component_itself(self):
+        self.registry.register(name="lazy", component=LAZY_COMPONENT_PATH)
+        self.registry.register(name="lazy", component=MockComponent)
+
+        self.assertIs(self.registry.get("lazy"), MockComponent)
+
+    def test_prevent_registering_path_twice(self):
+        self.registry.register(name="lazy", component=LAZY_COMPONENT_PATH)
+        with self.assertRaises(component.AlreadyRegistered):
+            self.registry.register(name="lazy", component=LAZY_COMPONENT_PATH)
+
+    def test_unregister_does_not_import(self):
+        self.registry.register(name="lazy", component=LAZY_COMPONENT_PATH)
+        self.registry.unregister("lazy")
+
+        self.assertNotIn(LAZY_COMPONENT_MODULE, sys.modules)
+
+    def test_manifest(self):
+        self.registry.register(name="lazy", component=LAZY_COMPONENT_PATH)
+        self.registry.register(name="mock", component=MockComponent)
+
+        self.assertEqual(self.registry.manifest(), {
+            "lazy": LAZY_COMPONENT_PATH,
+            "mock": "tests.test_registry.MockComponent",
+        })
+
+
+class ManifestSettingTest(unittest.TestCase):
+    def setUp(self):
+        sys.modules.pop(LAZY_COMPONENT_MODULE, None)
+
+    def tearDown(self):
+        component.registry.unregister("lazy_from_manifest")
+
+    def test_manifest_dict(self):
+        with override_settings(COMPONENTS={"autodiscover": False,
+                                           "manifest": {"lazy_from_manifest": LAZY_COMPONENT_PATH}}):
+            autodiscover()
+
+        self.assertFalse(component.registry.is_loaded("lazy_from_manifest"))
+        self.assertEqual(component.registry.get("lazy_from_manifest").__name__, "LazyComponent")
+
+    def test_manifest_file(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as f:
+            json.dump({"lazy_from_manifest": LAZY_COMPONENT_PATH}, f)
+            f.flush()
+            with override_settings(COMPONENTS={"autodiscover": False, "manifest": f.name}):
+                autodiscover()
+
+        self.assertEqual(component.registry.get("lazy_from_manifest").__name__, "LazyComponent")
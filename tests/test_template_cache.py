@@ -0,0 +1,121 @@
+from django.core.signals import setting_changed
+from django.template import Context, Template
+
+from .django_test_setup import *  # NOQA
+from django_components import component
+from django_components.component import is_slot_node
+from django_components.template_cache import LRUCache, template_cache
+
+from .testutils import Django30CompatibleSimpleTestCase as SimpleTestCase
+
+
+class SlottedComponent(component.Component):
+    def template(self, context):
+        return "slotted_template.html"
+
+
+class LRUCacheTest(SimpleTestCase):
+    def test_evicts_least_recently_used_entry(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+
+    def test_unbounded_cache(self):
+        cache = LRUCache(maxsize=None)
+        for i in range(1000):
+            cache.set(i, i)
+
+        self.assertEqual(len(cache), 1000)
+
+    def test_counts_hits_and_misses(self):
+        cache = LRUCache()
+        cache.get_or_set("a", lambda: 1)
+        cache.get_or_set("a", lambda: 2)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.info(), (2, 1, 128, 1))
+
+
+class ComponentTemplateCacheTest(SimpleTestCase):
+    def setUp(self):
+        component.registry.clear()
+        component.registry.register(name="test", component=SlottedComponent)
+        template_cache.clear()
+
+    def test_components_without_slots_share_compiled_template(self):
+        template = Template("{% load component_tags %}"
+                            "{% component 'test' %}{% component 'test' %}{% component 'test' %}")
+        template.render(Context({}))
+
+        self.assertEqual(template_cache.info().misses, 1)
+        self.assertEqual(template_cache.info().hits, 2)
+        self.assertEqual(len(template_cache), 1)
+
+    def test_components_with_different_slots_share_compiled_template(self):
+        template = Template("{% load component_tags %}"
+                            "{% component_block 'test' %}{% slot \"header\" %}One{% endslot %}"
+                            "{% endcomponent_block %}"
+                            "{% component_block 'test' %}{% slot \"header\" %}Two{% endslot %}"
+                            "{% endcomponent_block %}"
+                            "{% component 'test' %}")
+        rendered = template.render(Context({}))
+
+        self.assertIn("<header>One</header>", rendered)
+        self.assertIn("<header>Two</header>", rendered)
+        self.assertIn("<header>Default header</header>", rendered)
+        self.assertEqual(len(template_cache), 1)
+
+    def test_repeated_renders_compile_once(self):
+        template = Template("{% load component_tags %}"
+                            "{% component_block 'test' %}{% slot \"header\" %}One{% endslot %}"
+                            "{% endcomponent_block %}")
+        template.render(Context({}))
+        template.render(Context({}))
+
+        self.assertEqual(template_cache.info().misses, 1)
+        self.assertEqual(len(template_cache), 1)
+
+    def test_render_plan_recompiled_after_cache_is_cleared(self):
+        template = Template("{% load component_tags %}{% component 'test' %}")
+        template.render(Context({}))
+        template_cache.clear()
+        template.render(Context({}))
+
+        self.assertEqual(template_cache.info().misses, 1)
+        self.assertEqual(len(template_cache), 1)
+
+    def test_unexpected_slots_are_not_removed_from_component(self):
+        template = Template("{% load component_tags %}"
+                            "{% component_block 'test' %}{% slot \"missing\" %}One{% endslot %}"
+                            "{% endcomponent_block %}")
+        template.render(Context({}))
+        template_cache.clear()
+        template.render(Context({}))
+
+        component_node = template.nodelist[-1]
+        self.assertIn("missing", component_node.binding.slots)
+
+    def test_cache_cleared_when_templates_change(self):
+        Template("{% load component_tags %}{% component 'test' %}").render(Context({}))
+        setting_changed.send(sender=self.__class__, setting="TEMPLATES", value=None, enter=True)
+
+        self.assertEqual(len(template_cache), 0)
+
+    def test_render_plan_renders_default_slots(self):
+        plan = SlottedComponent("test").compile_instance_template("slotted_template.html")
+
+        self.assertTrue(plan.has_slots)
+        self.assertTrue(any(is_slot_node(node) for node in plan.template.nodelist))
+        self.assertHTMLEqual(plan.render(Context({})), """
+            <custom-template>
+                <header>Default header</header>
+                <main>Default main</main>
+                <footer>Default footer</footer>
+            </custom-template>
+        """)
@@ -0,0 +1,144 @@
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.template import Context, Engine, Origin, Template
+from django.template.base import Node, NodeList
+from django.test import override_settings
+
+from .django_test_setup import *  # NOQA
+from django_components import component
+from django_components.template_store import TemplateStore
+
+from .test_templatetags import SimpleComponent, SlottedComponent
+from .testutils import Django30CompatibleSimpleTestCase as SimpleTestCase
+
+SOURCE = (
+    '{% load component_tags %}'
+    '{% if a == 1 and not b or c in d %}if{% elif e %}elif{% endif %}'
+    '{% for item in items %}{% cycle "odd" "even" %}{{ item|upper|default:"none" }}{% endfor %}'
+    '{% component_block "store_slotted" %}{% slot "header" %}'
+    '{% component "store_simple" variable=a %}{% endslot %}{% endcomponent_block %}'
+)
+
+
+class RenamedVariableComponent(SimpleComponent):
+    def context(self, variable):
+        return {"variable": "renamed " + variable}
+
+
+class UnpicklableNode(Node):
+    def __init__(self):
+        self.func = lambda: None
+
+
+class TemplateStoreTest(SimpleTestCase):
+    def setUp(self):
+        component.registry.register(name="store_slotted", component=SlottedComponent)
+        component.registry.register(name="store_simple", component=SimpleComponent)
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.store = TemplateStore(self.directory)
+        self.engine = Engine(
+            dirs=["tests/templates/"],
+            loaders=[("django_components.template_store.Loader", ["django.template.loaders.filesystem.Loader"])],
+            libraries={"component_tags": "django_components.templatetags.component_tags"},
+        )
+
+    def tearDown(self):
+        component.registry.unregister("store_slotted")
+        component.registry.unregister("store_simple")
+
+    def load(self, source, origin=None):
+        template = Template(source, origin=origin, engine=self.engine)
+        key = self.store.key(source, self.engine)
+        self.assertTrue(self.store.save(key, template.nodelist))
+        return template, self.store.load(key, self.engine, template.origin)
+
+    def test_stored_template_renders_the_same(self):
+        template, nodelist = self.load(SOURCE)
+        context = {"a": 1, "d": [], "items": ["x", "y"]}
+
+        self.assertEqual(nodelist.render(Context(context)), template.render(Context(context)))
+
+    def test_engine_and_origin_are_not_copied(self):
+        origin = Origin("stored.html")
+        _, nodelist = self.load('{% if a %}{{ a }}{% endif %}', origin)
+
+        self.assertIs(nodelist[0].origin, origin)
+        self.assertIs(nodelist[0].conditions_nodelists[0][1][0].origin, origin)
+
+    def test_key_depends_on_source_and_version(self):
+        key = self.store.key(SOURCE, self.engine)
+
+        self.assertNotEqual(key, self.store.key(SOURCE + " ", self.engine))
+        self.assertNotEqual(key, TemplateStore(self.directory, version="2").key(SOURCE, self.engine))
+
+    def test_key_depends_on_node_layout(self):
+        key = self.store.key(SOURCE, self.engine)
+        with patch("django_components.template_store.NODE_LAYOUT", [("ComponentNode", ["component"])]):
+            self.assertNotEqual(key, self.store.key(SOURCE, self.engine))
+
+    def test_key_depends_on_package_version(self):
+        key = self.store.key(SOURCE, self.engine)
+        with patch("django_components.template_store.VERSION", "0.0"):
+            self.assertNotEqual(key, self.store.key(SOURCE, self.engine))
+
+    def test_components_are_looked_up_in_registry_when_loaded(self):
+        source = '{% load component_tags %}{% component "store_simple" variable="x" %}'
+        template = Template(source, engine=self.engine)
+        key = self.store.key(source, self.engine)
+        self.store.save(key, template.nodelist)
+
+        component.registry.unregister("store_simple")
+        component.registry.register(name="store_simple", component=RenamedVariableComponent)
+        nodelist = self.store.load(key, self.engine, template.origin)
+
+        self.assertIs(nodelist[-1].binding.component_class, RenamedVariableComponent)
+        self.assertEqual(nodelist.render(Context({})), "Variable: <strong>renamed x</strong>\n")
+
+    def test_template_with_unregistered_component_is_not_loaded(self):
+        source = '{% load component_tags %}{% component "store_simple" variable="x" %}'
+        template = Template(source, engine=self.engine)
+        key = self.store.key(source, self.engine)
+        self.store.save(key, template.nodelist)
+
+        component.registry.unregister("store_simple")
+        try:
+            self.assertIsNone(self.store.load(key, self.engine, template.origin))
+        finally:
+            component.registry.register(name="store_simple", component=SimpleComponent)
+
+    def test_unpicklable_template_is_not_stored(self):
+        key = self.store.key("unpicklable", self.engine)
+
+        self.assertFalse(self.store.save(key, NodeList([UnpicklableNode()])))
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_damaged_file_is_ignored(self):
+        key = self.store.key(SOURCE, self.engine)
+        with open(self.store.path(key), "wb") as f:
+            f.write(b"\x80\x04damaged")
+
+        self.assertIsNone(self.store.load(key, self.engine, Origin("damaged.html")))
+
+    def test_loader_loads_templates_from_store(self):
+        with override_settings(COMPONENTS={"template_store": self.directory}):
+            rendered = self.engine.get_template("slotted_template.html").render(Context({}))
+            self.assertEqual(len(os.listdir(self.directory)), 1)
+
+            # A fresh engine, like one in another process, doesn't compile the template again
+            engine = Engine(dirs=["tests/templates/"], loaders=self.engine.loaders, libraries=self.engine.libraries)
+            with patch.object(Template, "compile_nodelist", side_effect=AssertionError("Template was compiled")):
+                template = engine.get_template("slotted_template.html")
+
+        self.assertEqual(template.name, "slotted_template.html")
+        self.assertTrue(template.origin.name.endswith("slotted_template.html"))
+        self.assertEqual(template.render(Context({})), rendered)
+
+    def test_loader_without_store(self):
+        template = self.engine.get_template("simple_template.html")
+
+        self.assertEqual(template.render(Context({"variable": "x"})), "Variable: <strong>x</strong>\n")
+        self.assertEqual(os.listdir(self.directory), [])
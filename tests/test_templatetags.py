@@ -1,9 +1,11 @@
 from textwrap import dedent
 
-from django.template import Context, Template
+from django.template import Context, Template, TemplateSyntaxError
+from django.template.loader import get_template
 
 from .django_test_setup import *  # NOQA
 from django_components import component
+from django_components.component import get_slot_index
 
 from .testutils import Django30CompatibleSimpleTestCase as SimpleTestCase
 
@@ -51,6 +53,46 @@ class SlottedComponentWithContext(component.Component):
         return "slotted_template.html"
 
 
+class NestedSlotsComponent(component.Component):
+    def context(self, items=(), show_header=True):
+        return {"items": items, "show_header": show_header}
+
+    def template(self, context):
+        return "nested_slots_template.html"
+
+
+class ExtendedSlotComponent(component.Component):
+    def template(self, context):
+        return "extended_slot_template.html"
+
+
+class IncludeSlotComponent(component.Component):
+    def template(self, context):
+        return "include_slot_template.html"
+
+
+class PassthroughSlotComponent(component.Component):
+    def template(self, context):
+        return "passthrough_slot_template.html"
+
+
+class PureComponent(SimpleComponent):
+    pure_context = True
+    context_calls = 0
+
+    def context(self, variable, variable2="default"):
+        PureComponent.context_calls += 1
+        return super().context(variable, variable2)
+
+
+class SvgComponent(component.Component):
+    def context(self, name):
+        return {"name": name}
+
+    def template(self, context):
+        return "svg_{}.svg".format(context["name"])
+
+
 class ComponentWithProvidedAndDefaultParameters(component.Component):
     def context(self, variable, default_param="default text"):
         return {"variable": variable, 'default_param': default_param}
@@ -259,6 +301,105 @@ class SlottedTemplateRegressionTests(SimpleTestCase):
                              "Provided variable: <strong>provided value</strong>\nDefault: <p>default text</p>")
 
 
+class NestedSlotTests(SimpleTestCase):
+    def setUp(self):
+        component.registry.clear()
+        component.registry.register(name="nested", component=NestedSlotsComponent)
+        component.registry.register(name="extended", component=ExtendedSlotComponent)
+
+    def test_slots_nested_in_tags_are_filled(self):
+        template = Template(
+            '{% load component_tags %}{% component_block "nested" items=items %}'
+            '{% slot "header" %}Custom header{% endslot %}'
+            '{% slot "item" %}Item {{ item }}{% endslot %}'
+            '{% slot "main" %}Custom main{% endslot %}'
+            '{% endcomponent_block %}'
+        )
+        rendered = template.render(Context({"items": [1, 2]}))
+
+        self.assertHTMLEqual(rendered, """
+            <div>
+                <header>Custom header</header>
+                <ul><li>Item 1</li><li>Item 2</li></ul>
+                <main>Custom main</main>
+            </div>
+        """)
+
+    def test_unfilled_nested_slots_render_defaults(self):
+        template = Template(
+            '{% load component_tags %}{% component_block "nested" items=items %}'
+            '{% slot "main" %}Custom main{% endslot %}{% endcomponent_block %}'
+        )
+        rendered = template.render(Context({"items": ["a"]}))
+
+        self.assertHTMLEqual(rendered, """
+            <div>
+                <header>Default header</header>
+                <ul><li>a</li></ul>
+                <main>Custom main</main>
+            </div>
+        """)
+
+    def test_filling_slots_does_not_change_component_template(self):
+        Template(
+            '{% load component_tags %}{% component_block "nested" %}{% slot "header" %}Custom header{% endslot %}'
+            '{% endcomponent_block %}'
+        ).render(Context({}))
+
+        rendered = Template('{% load component_tags %}{% component "nested" %}').render(Context({}))
+        self.assertIn("<header>Default header</header>", rendered)
+
+    def test_slot_in_block_of_extending_template(self):
+        template = Template(
+            '{% load component_tags %}{% component_block "extended" %}{% slot "body" %}Custom body{% endslot %}'
+            '{% endcomponent_block %}{% component "extended" %}'
+        )
+
+        self.assertHTMLEqual(template.render(Context({})),
+                             "<article>Custom body</article><article>Default body</article>")
+
+    def test_fill_is_not_used_by_components_nested_in_it(self):
+        component.registry.register(name="slotted", component=SlottedComponent)
+        template = Template(
+            '{% load component_tags %}{% component_block "slotted" %}{% slot "header" %}'
+            '{% component "slotted" %}{% endslot %}{% endcomponent_block %}'
+        )
+        rendered = template.render(Context({}))
+
+        self.assertInHTML("<header>Default header</header>", rendered)
+        self.assertEqual(rendered.count("Default header"), 1)
+
+    def test_slot_inside_fill_is_filled_by_outer_component(self):
+        component.registry.register(name="slotted", component=SlottedComponent)
+        component.registry.register(name="passthrough", component=PassthroughSlotComponent)
+        template = Template(
+            '{% load component_tags %}{% component_block "passthrough" %}{% slot "title" %}Custom title{% endslot %}'
+            '{% endcomponent_block %}{% component "passthrough" %}'
+        )
+        rendered = template.render(Context({}))
+
+        self.assertInHTML("<header><h1>Custom title</h1></header>", rendered)
+        self.assertInHTML("<header><h1>Default title</h1></header>", rendered)
+
+    def test_fill_is_not_used_by_slots_included_by_component_without_slots(self):
+        component.registry.register(name="slotted", component=SlottedComponent)
+        component.registry.register(name="include", component=IncludeSlotComponent)
+        template = Template(
+            '{% load component_tags %}{% component_block "slotted" %}{% slot "header" %}'
+            '{% component "include" %}{% endslot %}{% endcomponent_block %}'
+        )
+        rendered = template.render(Context({}))
+
+        self.assertInHTML("<header><p>Included header</p></header>", rendered)
+
+    def test_slot_index_finds_nested_slots(self):
+        backend_template = get_template("nested_slots_template.html")
+
+        self.assertEqual(set(get_slot_index(backend_template.template)), {"header", "item", "main"})
+        self.assertEqual(NestedSlotsComponent.slots_in_template(backend_template)["main"].render(Context({})),
+                         "Default main")
+
+
 class MultiComponentTests(SimpleTestCase):
     def setUp(self):
         component.registry.clear()
@@ -312,6 +453,57 @@ class MultiComponentTests(SimpleTestCase):
         self.assertHTMLEqual(rendered, self.expected_result('', second_slot_content))
 
 
+class ComponentMapTemplateTagTest(SimpleTestCase):
+    def setUp(self):
+        component.registry.clear()
+        component.registry.register(name="test", component=SimpleComponent)
+        component.registry.register(name="svg", component=SvgComponent)
+
+    def test_renders_component_for_each_item(self):
+        template = Template('{% load component_tags %}{% component_map "test" items as item variable=item %}')
+        rendered = template.render(Context({"items": ["one", "two"]}))
+
+        self.assertHTMLEqual(rendered, "Variable: <strong>one</strong>\nVariable: <strong>two</strong>\n")
+
+    def test_matches_component_in_for_loop(self):
+        context = {"items": [{"name": "a"}, {"name": "b"}], "other": "x"}
+        for_loop = Template('{% load component_tags %}'
+                            '{% for item in items %}{% component "test" item.name variable2=other %}{% endfor %}')
+        component_map = Template('{% load component_tags %}'
+                                 '{% component_map "test" items as item item.name variable2=other %}')
+
+        self.assertEqual(component_map.render(Context(context)), for_loop.render(Context(context)))
+
+    def test_item_values_do_not_leak(self):
+        template = Template('{% load component_tags %}'
+                            '{% component_map "test" items as item variable=variable2 %}{{ item }}{{ variable }}')
+        rendered = template.render(Context({"items": [1, 2], "variable2": "outer"}))
+
+        # The first item's variable2 default mustn't be used as the second item's argument
+        self.assertHTMLEqual(rendered, "Variable: <strong>outer</strong>\nVariable: <strong>outer</strong>\n")
+
+    def test_template_can_change_between_items(self):
+        template = Template('{% load component_tags %}{% component_map "svg" names as name name %}')
+
+        self.assertHTMLEqual(template.render(Context({"names": ["dynamic1", "dynamic2"]})),
+                             "<svg>Dynamic1</svg><svg>Dynamic2</svg>")
+
+    def test_isolated_context(self):
+        template = Template('{% load component_tags %}'
+                            '{% component_map "test" items as item variable=item only %}')
+
+        self.assertHTMLEqual(template.render(Context({"items": ["one"]})), "Variable: <strong>one</strong>\n")
+
+    def test_empty_sequence(self):
+        template = Template('{% load component_tags %}{% component_map "test" items as item variable=item %}')
+
+        self.assertEqual(template.render(Context({})), "")
+
+    def test_requires_loop_variable(self):
+        with self.assertRaises(TemplateSyntaxError):
+            Template('{% load component_tags %}{% component_map "test" items variable=item %}')
+
+
 class TemplateInstrumentationTest(SimpleTestCase):
     @classmethod
     def setUpClass(cls):
@@ -356,3 +548,90 @@ class TemplateInstrumentationTest(SimpleTestCase):
         templates_used = self.templates_used_to_render(template)
         self.assertIn('slotted_template.html', templates_used)
         self.assertIn('simple_template.html', templates_used)
+
+
+class ComponentNodeFootprintTest(SimpleTestCase):
+    def setUp(self):
+        component.registry.clear()
+        component.registry.register(name="test", component=SlottedComponent)
+
+    def test_node_attributes_are_slots(self):
+        template = Template('{% load component_tags %}{% component_block "test" %}{% slot "header" %}Header'
+                            '{% endslot %}{% endcomponent_block %}')
+        component_node = template.nodelist[1]
+        slot_node = Template('{% load component_tags %}{% slot "header" %}Header{% endslot %}').nodelist[1]
+
+        # Node doesn't define __slots__, so instances can have a __dict__, but nothing is stored in it
+        self.assertEqual(vars(component_node), {})
+        self.assertEqual(vars(slot_node), {})
+        self.assertFalse(hasattr(component_node.binding, "__dict__"))
+        self.assertEqual(component_node.token.contents, 'component_block "test"')
+
+    def test_usages_without_arguments_share_empty_values(self):
+        template = Template('{% load component_tags %}{% component "test" %}{% component "test" %}')
+        first, second = template.nodelist[1], template.nodelist[2]
+
+        self.assertIs(first.arguments, second.arguments)
+        self.assertIs(first.binding.slots, second.binding.slots)
+        self.assertEqual(first.arguments.args, ())
+
+
+class ComponentArgumentsTest(SimpleTestCase):
+    def setUp(self):
+        component.registry.clear()
+        component.registry.register(name="test", component=SimpleComponent)
+        component.registry.register(name="pure", component=PureComponent)
+        PureComponent.context_calls = 0
+
+    def test_arguments_are_sorted_at_parse_time(self):
+        template = Template('{% load component_tags %}'
+                            '{% component "test" "literal" 2 value value|upper variable=3 variable2=value.name %}')
+        arguments = template.nodelist[1].arguments
+
+        self.assertEqual(arguments.args, ("literal", 2, None, None))
+        self.assertEqual(dict(arguments.kwargs), {"variable": 3})
+        self.assertEqual([(index, variable is not None) for index, _, variable in arguments.dynamic_args],
+                         [(2, True), (3, False)])
+        self.assertEqual([key for key, _, _ in arguments.dynamic_kwargs], ["variable2"])
+        self.assertFalse(arguments.is_literal)
+
+    def test_dynamic_arguments_are_resolved_per_render(self):
+        template = Template('{% load component_tags %}{% component "test" variable=value variable2=value|upper %}')
+
+        for value in ("one", "two"):
+            rendered = template.render(Context({"value": value}))
+            self.assertHTMLEqual(rendered, "Variable: <strong>%s</strong>\n" % value)
+
+    def test_missing_variable_resolves_like_filter_expression(self):
+        template = Template('{% load component_tags %}{% component "test" variable=missing.name %}')
+
+        self.assertHTMLEqual(template.render(Context({})), "Variable: <strong></strong>\n")
+
+    def test_translated_string_is_literal(self):
+        template = Template('{% load component_tags %}{% component "test" variable=_("Hello") %}')
+
+        self.assertTrue(template.nodelist[1].arguments.is_literal)
+        self.assertHTMLEqual(template.render(Context({})), "Variable: <strong>Hello</strong>\n")
+
+    def test_pure_context_is_computed_once_per_node(self):
+        template = Template('{% load component_tags %}{% component "pure" variable="one" %}'
+                            '{% component "pure" variable="two" %}')
+
+        for _ in range(3):
+            rendered = template.render(Context({}))
+        self.assertHTMLEqual(rendered, "Variable: <strong>one</strong>\nVariable: <strong>two</strong>\n")
+        self.assertEqual(PureComponent.context_calls, 2)
+
+    def test_pure_context_with_dynamic_arguments_is_computed_per_render(self):
+        template = Template('{% load component_tags %}{% component "pure" variable=value %}')
+
+        for value in ("one", "two"):
+            rendered = template.render(Context({"value": value}))
+        self.assertHTMLEqual(rendered, "Variable: <strong>two</strong>\n")
+        self.assertEqual(PureComponent.context_calls, 2)
+
+    def test_context_is_computed_per_render_unless_pure(self):
+        template = Template('{% load component_tags %}{% component "test" variable="one" %}')
+
+        self.assertIsNot(template.nodelist[1].get_component_context(SimpleComponent("test"), ("one",), {}),
+                         template.nodelist[1].get_component_context(SimpleComponent("test"), ("one",), {}))
@@ -0,0 +1,76 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.apps import apps
+from django.core.management import call_command
+from django.test import override_settings
+
+from .django_test_setup import *  # NOQA
+from django_components import component
+from django_components.template_cache import template_cache
+from django_components.warmup import WarmUpResult, warm_up
+
+from .testutils import Django30CompatibleSimpleTestCase as SimpleTestCase
+
+
+class SimpleComponent(component.Component):
+    def template(self, context):
+        return "simple_template.html"
+
+
+class SvgComponent(component.Component):
+    template_variants = ("svg_dynamic1.svg", "svg_dynamic2.svg")
+
+    def template(self, context):
+        return "svg_{}.svg".format(context["name"])
+
+
+class BrokenComponent(component.Component):
+    def template(self, context):
+        return "svg_{}.svg".format(context["name"])
+
+
+class WarmUpTest(SimpleTestCase):
+    def setUp(self):
+        self.registry = component.ComponentRegistry()
+        self.registry.register(name="simple", component=SimpleComponent)
+        self.registry.register(name="svg", component=SvgComponent)
+        template_cache.clear()
+
+    def test_compiles_component_templates(self):
+        result = warm_up(self.registry)
+
+        self.assertEqual((result.components, result.templates, result.errors), (2, 3, []))
+        self.assertIn((SimpleComponent, "simple_template.html"), template_cache)
+        self.assertIn((SvgComponent, "svg_dynamic1.svg"), template_cache)
+        self.assertIn((SvgComponent, "svg_dynamic2.svg"), template_cache)
+
+    def test_collects_errors(self):
+        self.registry.register(name="broken", component=BrokenComponent)
+        result = warm_up(self.registry)
+
+        self.assertEqual(result.templates, 3)
+        self.assertEqual([name for name, error in result.errors], ["broken"])
+        self.assertIsInstance(result.errors[0][1], KeyError)
+
+    def test_command(self):
+        stdout, stderr = StringIO(), StringIO()
+        with patch("django_components.warmup.registry", self.registry):
+            self.registry.register(name="broken", component=BrokenComponent)
+            call_command("warmupcomponents", stdout=stdout, stderr=stderr)
+
+        self.assertIn("Warmed up 3 templates for 3 components in ", stdout.getvalue())
+        self.assertIn("Could not warm up component 'broken'", stderr.getvalue())
+
+    def test_warm_up_on_startup(self):
+        result = WarmUpResult(3, 3, [("broken", KeyError("name"))], 0.25)
+        with patch("django_components.warmup.warm_up", return_value=result) as warm_up_mock:
+            with override_settings(COMPONENTS={"autodiscover": False, "warm_up": True}):
+                with self.assertLogs("django_components.apps", "INFO") as logs:
+                    apps.get_app_config("django_components").ready()
+
+        warm_up_mock.assert_called_once_with()
+        self.assertEqual(logs.output, [
+            "WARNING:django_components.apps:Could not warm up component 'broken': KeyError('name')",
+            "INFO:django_components.apps:Warmed up 3 templates for 3 components in 0.250 s.",
+        ])
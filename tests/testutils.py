@@ -1,8 +1,11 @@
+import os
+import shutil
+import tempfile
 from unittest.mock import Mock
 
 from django.template import Template, Context
 from django.template.response import TemplateResponse
-from django.test import SimpleTestCase, TestCase
+from django.test import SimpleTestCase, TestCase, override_settings
 
 from django_components.middleware import ComponentDependencyMiddleware
 
@@ -30,4 +33,38 @@ def create_and_process_template_response(template, context=None):
     response = TemplateResponse(request, mock_template, context)
     middleware.process_template_response(request, response)
     response.render()
-    return response
\ No newline at end of file
+    return response
+
+class StaticFilesMixin:
+    """Make the static_files of a test case available to the staticfiles finders, from a temporary directory, and
+    collect static files to another temporary directory."""
+
+    static_files = {}
+    component_settings = {}
+
+    def setUp(self):
+        super().setUp()
+        self.source_directory = tempfile.mkdtemp()
+        self.static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.source_directory)
+        self.addCleanup(shutil.rmtree, self.static_root)
+        for name, content in self.static_files.items():
+            self.write(name, content)
+        self.use_settings(COMPONENTS=self.component_settings)
+
+    def use_settings(self, **kwargs):
+        """Override settings until the end of the test, on top of the static file settings."""
+
+        settings_override = override_settings(
+            STATIC_URL="/static/", STATIC_ROOT=self.static_root, STATICFILES_DIRS=[self.source_directory], **kwargs
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def write(self, name, content, mtime=None):
+        path = os.path.join(self.source_directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))